@@ -2,6 +2,7 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import Config, RepositoryEnv 
 import dj_database_url
+import importlib.util
 import os
 
 # ----------------------------
@@ -110,6 +111,14 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# ----------------------------
+# N+1 QUERY DETECTION (DEV ONLY)
+# ----------------------------
+if DEBUG and config("NPLUSONE_ENABLED", default=True, cast=bool) and importlib.util.find_spec("nplusone"):
+    INSTALLED_APPS += ["nplusone.ext.django"]
+    MIDDLEWARE.insert(0, "nplusone.ext.django.NPlusOneMiddleware")
+    NPLUSONE_RAISE = config("NPLUSONE_RAISE", default=False, cast=bool)
+
 # ----------------------------
 # REST FRAMEWORK
 # ----------------------------
@@ -120,6 +129,10 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_THROTTLE_CLASSES": (
         "rest_framework.throttling.UserRateThrottle",
     ),
@@ -197,6 +210,11 @@ EMAIL_BACKEND = config("EMAIL_BACKEND", default="core.emails.SendGridBackend")
 SENDGRID_API_KEY = config("SENDGRID_API_KEY")
 EMAIL_FROM = config("EMAIL_FROM")
 
+# ----------------------------
+# ORDER EVENTS
+# ----------------------------
+ORDER_STATUS_EMAILS_ENABLED = config("ORDER_STATUS_EMAILS_ENABLED", default=False, cast=bool)
+
 # ----------------------------
 # FRONTEND URL
 # ----------------------------
@@ -236,6 +254,7 @@ CLOUDINARY_API_SECRET = config("CLOUDINARY_API_SECRET")
 # ----------------------------
 STRIPE_PUBLIC_KEY = config("STRIPE_PUBLIC_KEY")
 STRIPE_SECRET_KEY = config("STRIPE_SECRET_KEY")
+STRIPE_WEBHOOK_SECRET = config("STRIPE_WEBHOOK_SECRET", default="")
 
 RAZORPAY_KEY_ID = config("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = config("RAZORPAY_KEY_SECRET")
@@ -244,6 +263,9 @@ RAZORPAY_KEY_SECRET = config("RAZORPAY_KEY_SECRET")
 # DATABASE
 # ----------------------------
 ENV = config("ENV", default="local")
+# Persistent connections only pay off for a networked database; SQLite opens
+# a local file, so the local config keeps Django's per-request connections.
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=600, cast=int)
 
 if ENV == "local":
     DATABASES = {
@@ -256,7 +278,8 @@ else:
     DATABASES = {
         "default": dj_database_url.parse(
             config("DATABASE_URL"),
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=True,
             ssl_require=True,
         )
     }
@@ -280,6 +303,26 @@ else:
         },
     }
 
+# ----------------------------
+# CACHE
+# ----------------------------
+# The app caches rely on write-time invalidation (signals, version bumps), so
+# every process must share one cache: a per-process LocMemCache would only be
+# invalidated in the process that handled the write.
+if ENV == "local":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": config("REDIS_URL", default="redis://127.0.0.1:6379"),
+        },
+    }
+
 # ----------------------------
 # PASSWORD VALIDATORS
 # ----------------------------
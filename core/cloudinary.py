@@ -1,5 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from threading import Thread
+
 import cloudinary.uploader
 from django.conf import settings
+from django.db import connection, transaction
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
 
 cloudinary.config(
     cloud_name=settings.CLOUDINARY_CLOUD_NAME,
@@ -20,3 +29,38 @@ def upload_to_cloudinary(file, folder="default", use_filename=True, unique_filen
         return result.get("secure_url")
     except Exception as e:
         raise Exception(f"Cloudinary upload failed: {str(e)}")
+
+def upload_many_to_cloudinary(files, folder="default", max_workers=8):
+    """
+    Uploads ``files`` concurrently and returns their URLs in the same order,
+    so a batch takes roughly as long as its slowest file.
+    """
+    if len(files) == 1:
+        return [upload_to_cloudinary(files[0], folder=folder)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+        return list(executor.map(lambda f: upload_to_cloudinary(f, folder=folder), files))
+
+
+def upload_to_cloudinary_in_background(file, model, pk, field, folder="default", on_complete=None):
+    """
+    Uploads ``file`` on a background thread once the current transaction commits,
+    then stores the resulting URL in ``field`` of the ``model`` row ``pk``.
+
+    The file is read into memory up front because the request's upload handle
+    is closed as soon as the response is sent.
+    """
+    payload = BytesIO(file.read())
+    payload.name = getattr(file, "name", None) or "upload"
+
+    def _run():
+        try:
+            url = upload_to_cloudinary(payload, folder=folder)
+            model._base_manager.filter(pk=pk).update(**{field: url})
+            if on_complete:
+                on_complete()
+        except Exception as e:
+            logger.error(f"Background upload failed for {model.__name__} {pk}: {e}")
+        finally:
+            connection.close()
+
+    transaction.on_commit(lambda: Thread(target=_run, daemon=True).start())
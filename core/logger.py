@@ -1,7 +1,9 @@
+import atexit
 import logging
 import os
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from queue import Full, Queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorlog import ColoredFormatter
 
 
@@ -57,13 +59,84 @@ error_handler.setLevel(logging.ERROR)
 error_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 
 
+# ==============================================================
+# QUEUED LOGGING
+# ==============================================================
+# Callers only enqueue the record; a background thread does the formatting
+# and console/file writes, keeping handler locks and I/O off the request path.
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records quietly when the queue is full, instead
+    of reporting a logging error for each one on the calling thread. The
+    number dropped is logged as a warning once the queue has room again.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        # Only touched under the handler lock that handle() holds around emit().
+        self.dropped = 0
+
+    def drop_report(self):
+        return logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "Log queue was full: dropped %d log records", (self.dropped,), None
+        )
+
+    def enqueue(self, record):
+        if self.dropped:
+            try:
+                self.queue.put_nowait(self.drop_report())
+                self.dropped = 0
+            except Full:
+                pass
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+class BlockingStopQueueListener(QueueListener):
+    """
+    QueueListener whose stop() waits for room for its sentinel, so a full
+    queue at exit is drained rather than raising queue.Full.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+LOG_QUEUE_SIZE = 10000
+log_queue = Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+# prepare() only needs the message merged with its args; the listener's
+# handlers add the timestamp/level/name prefix.
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+queue_listener = BlockingStopQueueListener(
+    log_queue,
+    console_handler,
+    info_handler,
+    error_handler,
+    respect_handler_level=True,
+)
+queue_listener.start()
+
+
+def _stop_queue_listener():
+    # Report drops that never got a later record to carry them, then drain.
+    if queue_handler.dropped:
+        log_queue.put(queue_handler.drop_report())
+    queue_listener.stop()
+
+
+atexit.register(_stop_queue_listener)
+
+
 # ==============================================================
 # BASE LOGGING CONFIGURATION
 # ==============================================================
 logging.basicConfig(
     level=logging.DEBUG,
-    handlers=[console_handler, info_handler, error_handler],
-    format=LOG_FORMAT,
+    handlers=[queue_handler],
 )
 
 
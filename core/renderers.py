@@ -0,0 +1,28 @@
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+# -----------------------------
+# RENDERERS
+# -----------------------------
+# Types orjson doesn't know natively (Decimal, lazy strings, timedelta, ...)
+# fall back to DRF's encoder so the output matches JSONRenderer.
+_drf_default = JSONEncoder().default
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    JSONRenderer replacement that encodes with orjson.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Non-str keys: DRF keys ListField/DictField errors by integer index.
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if (renderer_context or {}).get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_drf_default, option=option)
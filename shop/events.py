@@ -0,0 +1,62 @@
+from threading import Thread
+from django.conf import settings
+from django.db import connection, transaction
+from core.logger import get_logger
+from core.utils import _send_email_sync
+from shop.models import Order
+
+logger = get_logger(__name__)
+
+# =============================================================
+# ORDER STATUS MESSAGES
+# =============================================================
+ORDER_STATUS_MESSAGES = {
+    "CONFIRMED": "Your order #{order_id} has been confirmed.",
+    "SHIPPED": "Your order #{order_id} has been shipped.",
+    "DELIVERED": "Your order #{order_id} has been delivered.",
+    "CANCELLED": "Your order #{order_id} has been cancelled.",
+}
+
+# =============================================================
+# PROCESS ORDER STATUS CHANGE
+# =============================================================
+def process_order_status_change(order_id, new_status):
+    """
+    Runs the follow-on work for an order that moved to ``new_status``
+    (customer notification). Called off the request thread.
+    """
+    try:
+        message = ORDER_STATUS_MESSAGES.get(new_status)
+        if not message or not getattr(settings, "ORDER_STATUS_EMAILS_ENABLED", False):
+            return
+
+        order = Order.objects.select_related('user').only(
+            'id', 'user__email', 'user__username'
+        ).get(pk=order_id)
+        _send_email_sync(
+            order.user.email,
+            f"Order {new_status.title()}",
+            "generic",
+            {"username": order.user.username, "message": message.format(order_id=order.id)},
+        )
+    except Exception as e:
+        logger.error(f"Order status side effects failed for order {order_id} ({new_status}): {e}")
+    finally:
+        connection.close()
+
+# =============================================================
+# QUEUE ORDER STATUS CHANGE
+# =============================================================
+def queue_order_status_change(order_id, new_status):
+    """
+    Schedules ``process_order_status_change`` on a background thread once
+    the current transaction commits, so the HTTP response never waits on it
+    and nothing runs for a rolled-back status change.
+    """
+    transaction.on_commit(
+        lambda: Thread(
+            target=process_order_status_change,
+            args=(order_id, new_status),
+            daemon=True
+        ).start()
+    )
@@ -0,0 +1,33 @@
+"""
+===================================================================
+Idempotency Record Cleanup
+===================================================================
+Usage Example: python manage.py purge_idempotency_records
+===================================================================
+"""
+
+import logging
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from shop.models import IdempotencyRecord
+
+# ============================================================
+# LOGGER CONFIGURATION
+# ============================================================
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# DJANGO MANAGEMENT COMMAND
+# ============================================================
+class Command(BaseCommand):
+    """
+    Deletes idempotency records older than their 24h replay window.
+    Meant to be scheduled (e.g. a nightly cron job).
+    """
+
+    help = "Delete expired payment idempotency records."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - IdempotencyRecord.TTL
+        deleted, _ = IdempotencyRecord.all_objects.filter(created_at__lt=cutoff).delete()
+        logger.info(f"Purged {deleted} expired idempotency records.")
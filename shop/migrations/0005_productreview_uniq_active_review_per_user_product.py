@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0004_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='productreview',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('user', 'product'), name='uniq_active_review_per_user_product'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 import uuid
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models import Min, Max
 from django.utils import timezone
@@ -302,6 +304,33 @@ class Payment(BaseModel):
     refund_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     refunded_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['transaction_id'], name='payment_txn_idx')
+        ]
+
+
+# ===============================
+# IDEMPOTENCY RECORD MODEL
+# ===============================
+class IdempotencyRecord(BaseModel):
+    user = models.ForeignKey(User, related_name="idempotency_records", on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_json = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    TTL = timedelta(hours=24)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user')
+        ]
+
+    @property
+    def is_expired(self):
+        return self.created_at < timezone.now() - self.TTL
+
 
 # ===============================
 # WISHLIST MODEL
@@ -326,6 +355,13 @@ class ProductReview(BaseModel):
     class Meta:
         unique_together = ('product', 'user', 'order_item')
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'product'],
+                condition=models.Q(is_active=True),
+                name='uniq_active_review_per_user_product'
+            )
+        ]
 
     def clean(self):
         if not (1 <= self.rating <= 5):
@@ -334,7 +370,9 @@ class ProductReview(BaseModel):
             raise ValidationError({"order_item": "Order item does not belong to this user."})
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # Uniqueness and constraints are enforced by the database (callers map the
+        # IntegrityError); skip the extra validation SELECTs.
+        self.full_clean(validate_unique=False, validate_constraints=False)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -68,6 +68,15 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
 
 
+# ===============================
+# PRODUCT SUMMARY SERIALIZER
+# ===============================
+class ProductSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'slug', 'main_image']
+
+
 # ===============================
 # PRODUCT IMAGE UPLOAD SERIALIZER
 # ===============================
@@ -78,16 +87,20 @@ class ProductImageUploadSerializer(serializers.Serializer):
 # ===============================
 # CART ITEM SERIALIZER
 # ===============================
-class ProductVariantInCartSerializer(serializers.ModelSerializer):
-    discount_percentage = serializers.ReadOnlyField()
-    in_stock = serializers.ReadOnlyField()
-
-    class Meta:
-        model = ProductVariant
-        fields = [
-            'id', 'sku', 'color', 'size', 'price', 'compare_price',
-            'stock', 'track_inventory', 'discount_percentage', 'in_stock'
-        ]
+def variant_in_cart_data(variant):
+    """Plain-dict variant payload for cart items, built without a serializer per item."""
+    return {
+        "id": str(variant.id),
+        "sku": variant.sku,
+        "color": variant.color,
+        "size": variant.size,
+        "price": str(variant.price),
+        "compare_price": str(variant.compare_price) if variant.compare_price is not None else None,
+        "stock": variant.stock,
+        "track_inventory": variant.track_inventory,
+        "discount_percentage": variant.discount_percentage,
+        "in_stock": variant.in_stock,
+    }
 
 
 class CartItemSerializer(serializers.ModelSerializer):
@@ -108,9 +121,9 @@ class CartItemSerializer(serializers.ModelSerializer):
             "description": product.description,
             "is_featured": product.is_featured,
             "main_image": product.main_image,
-            "category": product.category.id,
-            "seller": product.seller.id,
-            "variant": ProductVariantInCartSerializer(obj.variant).data
+            "category": product.category_id,
+            "seller": product.seller_id,
+            "variant": variant_in_cart_data(obj.variant)
         }
 
 
@@ -127,7 +140,7 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'items', 'subtotal', 'total_price']
 
     def get_subtotal(self, obj):
-        return sum(item.total_price for item in obj.items.filter(is_active=True))
+        return sum(item.total_price for item in obj.items.all() if item.is_active)
 
     def get_total_price(self, obj):
         return self.get_subtotal(obj)
@@ -230,7 +243,7 @@ class WishlistSerializer(serializers.ModelSerializer):
 # PRODUCT REVIEW SERIALIZER
 # ===============================
 class ProductReviewSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = ProductSummarySerializer(read_only=True)
 
     class Meta:
         model = ProductReview
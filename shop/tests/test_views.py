@@ -0,0 +1,76 @@
+import hashlib
+import hmac
+import json
+import time
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import User
+from shop.models import Order, Payment, Product
+
+pytestmark = pytest.mark.django_db
+
+WEBHOOK_SECRET = "whsec_test"
+
+
+def stripe_signature(payload, secret=WEBHOOK_SECRET):
+    """Builds a Stripe-Signature header the way Stripe signs webhook payloads"""
+    timestamp = int(time.time())
+    signed = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signed}"
+
+
+def checkout_completed_event(session_id):
+    return json.dumps({
+        "id": "evt_test",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": session_id, "object": "checkout.session", "payment_status": "paid"}},
+    })
+
+
+class TestStripeWebhook:
+    @pytest.fixture(autouse=True)
+    def webhook_secret(self, settings):
+        settings.STRIPE_WEBHOOK_SECRET = WEBHOOK_SECRET
+
+    def post(self, payload, signature):
+        return APIClient().post(
+            reverse("shop:payment-stripe-webhook"), payload, content_type="application/json", HTTP_STRIPE_SIGNATURE=signature
+        )
+
+    def test_rejects_invalid_signature(self):
+        payload = checkout_completed_event("cs_test_1")
+        response = self.post(payload, stripe_signature(payload, secret="whsec_wrong"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["message"] == "Invalid Stripe webhook signature."
+
+    def test_checkout_completed_confirms_payment(self):
+        payment = baker.make(Payment, transaction_id="cs_test_1", status="PENDING", amount=100, order__status="PENDING")
+        payload = checkout_completed_event("cs_test_1")
+        response = self.post(payload, stripe_signature(payload))
+
+        assert response.status_code == status.HTTP_200_OK
+        payment.refresh_from_db()
+        assert payment.status == "SUCCESS"
+        assert payment.paid_at is not None
+        assert Order.objects.get(pk=payment.order_id).status == "CONFIRMED"
+
+
+class TestProductReviewCreate:
+    def test_duplicate_review_is_rejected(self):
+        user = baker.make(User)
+        product = baker.make(Product)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse("shop:product-reviews-list", kwargs={"product_pk": product.pk})
+        payload = {"user": str(user.pk), "rating": 5, "title": "Great"}
+
+        assert client.post(url, payload, format="json").status_code == status.HTTP_201_CREATED
+        response = client.post(url, payload, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["message"] == "You have already reviewed this product."
@@ -1,19 +1,31 @@
+import hashlib
+import json
+import time
 import razorpay
 import stripe
+from requests.adapters import HTTPAdapter
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
+from rest_framework.response import Response
 from django.conf import settings
-from django.db import transaction
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Avg, Case, DecimalField, F, IntegerField, Prefetch, Sum, Value, When, prefetch_related_objects
+)
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from core.utils import api_response
+from core.logger import get_logger
+from core.cloudinary import upload_to_cloudinary_in_background
+from shop.events import queue_order_status_change
 from core.permissions import IsAdminOrSuperAdmin, IsOwnerOrAdmin, IsSuperAdmin, IsAuthenticatedUser
 from shop.models import (
     Category, Product, ProductVariant, 
     ProductImage, Cart, CartItem,
     Address, Coupon, Order, OrderItem,
-    Payment, ProductReview
+    Payment, ProductReview, Wishlist, IdempotencyRecord
 )
 from shop.serializers import (
     CategorySerializer, CategoryImageUploadSerializer,
@@ -24,7 +36,207 @@ from shop.serializers import (
     OrderItemSerializer, PaymentSerializer, ProductReviewSerializer,
     WishlistSerializer
 )
-from decimal import Decimal
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+logger = get_logger(__name__)
+
+# =============================================================
+# PAYMENT GATEWAY CLIENTS
+# =============================================================
+# Built once per process so the underlying HTTP connection pool is reused across requests.
+RAZORPAY_CLIENT = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+RAZORPAY_CLIENT.session.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50))
+stripe.api_key = settings.STRIPE_SECRET_KEY
+
+COUPON_CACHE_TIMEOUT = 60
+PRODUCT_RATING_CACHE_TIMEOUT = 60
+PRODUCT_LIST_CACHE = "prod-list"
+PRODUCT_LIST_CACHE_TIMEOUT = 30
+CATEGORY_LIST_CACHE = "cat-list"
+CATEGORY_LIST_CACHE_TIMEOUT = 60 * 5
+
+# Columns read by Coupon.is_valid and Coupon.calculate_discount.
+COUPON_FIELDS = (
+    'id', 'code', 'is_active', 'discount_type', 'discount_value', 'min_order_value',
+    'max_discount', 'valid_from', 'valid_to', 'usage_limit', 'used_count'
+)
+
+# =============================================================
+# HELPER: versioned list response cache
+# =============================================================
+def _list_cache_version(namespace):
+    return cache.get_or_set(f"{namespace}:version", time.time_ns(), None)
+
+
+def _bump_list_cache_version(namespace):
+    """
+    Invalidate every cached page of ``namespace`` by moving to a new version.
+    Runs after commit, so a concurrent list request can't re-cache pre-commit
+    rows under the new version and a rolled-back write keeps the old pages.
+    """
+    transaction.on_commit(lambda: cache.set(f"{namespace}:version", time.time_ns(), None))
+
+
+def _cached_list_response(namespace, timeout, request, build_response):
+    key = f"{namespace}:{_list_cache_version(namespace)}:{request.get_full_path()}"
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+    response = build_response()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, timeout)
+    return response
+
+# =============================================================
+# HELPER: idempotent request handling
+# =============================================================
+def _idempotent_response(request, scope, handler):
+    """
+    Replays the stored response when a client retries with the same
+    ``Idempotency-Key`` header, so the payment gateway is only called once.
+    A reused key with a different body is rejected with 422.
+    """
+    key = request.headers.get("Idempotency-Key")
+    if not key:
+        return handler()
+
+    request_hash = hashlib.sha256(
+        json.dumps(request.data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    with transaction.atomic():
+        record, created = IdempotencyRecord.objects.select_for_update().get_or_create(
+            user=request.user, key=f"{scope}:{key}", defaults={"request_hash": request_hash}
+        )
+        if not created and record.is_expired:
+            record.delete(hard=True)
+            record = IdempotencyRecord.objects.create(
+                user=request.user, key=f"{scope}:{key}", request_hash=request_hash
+            )
+        elif not created:
+            if record.request_hash != request_hash:
+                return api_response(
+                    False, "Idempotency-Key was already used with a different request.",
+                    None, status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if record.response_json is not None:
+                return Response(record.response_json, status=record.status_code)
+
+        response = handler()
+        if response.status_code < 500:
+            record.response_json = response.data
+            record.status_code = response.status_code
+            record.save(update_fields=['response_json', 'status_code', 'updated_at'])
+        return response
+
+# =============================================================
+# HELPER: stock adjustments
+# =============================================================
+def _apply_stock_deltas(deltas):
+    """
+    Adds ``deltas[variant_id]`` to each tracked variant's stock in a single
+    UPDATE ... SET stock = stock + CASE id WHEN ... END statement.
+    """
+    if not deltas:
+        return
+    ProductVariant.objects.filter(id__in=deltas, track_inventory=True).update(
+        stock=F('stock') + Case(
+            *[When(id=variant_id, then=Value(delta)) for variant_id, delta in deltas.items()],
+            output_field=IntegerField()
+        )
+    )
+
+# =============================================================
+# HELPER: order querysets
+# =============================================================
+def _order_items_prefetch():
+    # OrderSerializer renders items with their nested variant; user/address/coupon are plain PKs.
+    return Prefetch('items', queryset=OrderItem.objects.select_related('variant'))
+
+
+def _orders_queryset():
+    return Order.objects.prefetch_related(_order_items_prefetch())
+
+# =============================================================
+# HELPER: amount in minor currency units
+# =============================================================
+def _to_minor_units(amount):
+    # Gateways take integer paise/cents; stay in Decimal to avoid float rounding.
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+# =============================================================
+# HELPER: locked pending payment
+# =============================================================
+def _lock_order_payment(user, order_id, method):
+    """
+    Returns the user's order and its payment row, creating the payment on
+    first use. Both rows stay locked until the surrounding transaction ends,
+    so concurrent create-order calls for one order queue instead of racing.
+    """
+    order = Order.objects.select_for_update().only('id', 'total_amount').get(id=order_id, user=user)
+    payment = Payment.objects.select_for_update().filter(order=order).first()
+    if payment is None:
+        payment = Payment.objects.create(
+            order=order,
+            user=user,
+            method=method,
+            amount=order.total_amount,
+            status="PENDING",
+            transaction_id=""
+        )
+    return order, payment
+
+# =============================================================
+# HELPER: mark payment as paid
+# =============================================================
+def _confirm_payment(transaction_id, **changes):
+    """
+    Marks the payment identified by ``transaction_id`` as paid and confirms its
+    order. The payment row is locked and updated conditionally, so concurrent
+    verify calls or gateway retries apply it once. Returns the payment, or
+    None if it was already processed.
+    """
+    now = timezone.now()
+    changes.update(status="SUCCESS", paid_at=now, updated_at=now)
+    with transaction.atomic():
+        payment = Payment.objects.select_for_update().get(transaction_id=transaction_id)
+        updated = Payment.objects.filter(pk=payment.pk).exclude(status="SUCCESS").update(**changes)
+        if not updated:
+            return None
+        Order.objects.filter(pk=payment.order_id).update(status="CONFIRMED", updated_at=now)
+        queue_order_status_change(payment.order_id, "CONFIRMED")
+
+    for field, value in changes.items():
+        setattr(payment, field, value)
+    return payment
+
+# =============================================================
+# HELPER: cached product rating
+# =============================================================
+def _product_rating_cache_key(product_id):
+    return f"prod_rating:{product_id}"
+
+
+def _invalidate_product_rating(product_id):
+    cache.delete(_product_rating_cache_key(product_id))
+
+# =============================================================
+# HELPER: cached coupon lookup
+# =============================================================
+def _coupon_cache_key(code):
+    return f"coupon:{code}"
+
+
+def _get_coupon(code):
+    """Return the active coupon for ``code`` or None, cached for a short TTL."""
+    key = _coupon_cache_key(code)
+    coupon = cache.get(key)
+    if coupon is None:
+        # Cache misses as False so unknown codes don't hit the DB every time.
+        coupon = Coupon.objects.only(*COUPON_FIELDS).filter(code=code, is_active=True).first() or False
+        cache.set(key, coupon, COUPON_CACHE_TIMEOUT)
+    return coupon or None
 
 # =============================================================
 # CATEGORY VIEWSET
@@ -37,11 +249,18 @@ class CategoryViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
     ordering_fields = ['created_at', 'updated_at']
 
+    def list(self, request, *args, **kwargs):
+        return _cached_list_response(
+            CATEGORY_LIST_CACHE, CATEGORY_LIST_CACHE_TIMEOUT, request,
+            lambda: super(CategoryViewSet, self).list(request, *args, **kwargs)
+        )
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         category = serializer.save()
+        _bump_list_cache_version(CATEGORY_LIST_CACHE)
         return api_response(
             True, "Category created successfully.",
             serializer.data, status_code=status.HTTP_201_CREATED
@@ -59,6 +278,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         category = serializer.save()
+        _bump_list_cache_version(CATEGORY_LIST_CACHE)
         return api_response(True, "Category updated successfully.", serializer.data)
 
     def partial_update(self, request, *args, **kwargs):
@@ -68,6 +288,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.delete()
+        _bump_list_cache_version(CATEGORY_LIST_CACHE)
         return api_response(True, "Category deleted successfully.", None, status_code=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=['POST'], url_path='restore')
@@ -79,6 +300,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
             category.restore()
         except ValidationError as e:
             return api_response(False, str(e), None, status_code=status.HTTP_400_BAD_REQUEST)
+        _bump_list_cache_version(CATEGORY_LIST_CACHE)
         serializer = self.get_serializer(category)
         return api_response(True, "Category restored successfully.", serializer.data)
 
@@ -87,9 +309,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
         category = self.get_object()
         serializer = CategoryImageUploadSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        category._image_file = serializer.validated_data['file']
-        category.save()
-        return api_response(True, "Category image uploaded successfully.", {"image": category.image})
+        upload_to_cloudinary_in_background(
+            serializer.validated_data['file'], Category, category.pk, 'image',
+            folder="categories", on_complete=lambda: _bump_list_cache_version(CATEGORY_LIST_CACHE)
+        )
+        return api_response(
+            True, "Category image upload accepted.", {"image": category.image},
+            status_code=status.HTTP_202_ACCEPTED
+        )
 
 # =============================================================
 # PRODUCT VIEWSET
@@ -102,11 +329,34 @@ class ProductViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description', 'category__name']
     ordering_fields = ['price', 'created_at', 'updated_at']
 
+    # Columns returned by the list endpoint; the full serializer is kept for retrieve.
+    LIST_FIELDS = ('id', 'name', 'slug', 'main_image', 'category_id', 'seller_id', 'is_featured')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # The list endpoint projects plain columns; everything else renders nested variants.
+        if self.action != 'list':
+            queryset = queryset.prefetch_related('variants')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return _cached_list_response(
+            PRODUCT_LIST_CACHE, PRODUCT_LIST_CACHE_TIMEOUT, request, self._build_list_response
+        )
+
+    def _build_list_response(self):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.LIST_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list(page))
+        return api_response(True, "Products retrieved successfully.", list(queryset))
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         product = serializer.save()
+        _bump_list_cache_version(PRODUCT_LIST_CACHE)
         return api_response(True, "Product created successfully.", serializer.data, status_code=status.HTTP_201_CREATED)
 
     def retrieve(self, request, *args, **kwargs):
@@ -121,6 +371,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         product = serializer.save()
+        _bump_list_cache_version(PRODUCT_LIST_CACHE)
         return api_response(True, "Product updated successfully.", serializer.data)
 
     def partial_update(self, request, *args, **kwargs):
@@ -130,6 +381,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.delete()
+        _bump_list_cache_version(PRODUCT_LIST_CACHE)
         return api_response(True, "Product deleted successfully.", None, status_code=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=['POST'], url_path='restore')
@@ -141,6 +393,7 @@ class ProductViewSet(viewsets.ModelViewSet):
             product.restore()
         except ValidationError as e:
             return api_response(False, str(e), None, status_code=status.HTTP_400_BAD_REQUEST)
+        _bump_list_cache_version(PRODUCT_LIST_CACHE)
         serializer = self.get_serializer(product)
         return api_response(True, "Product restored successfully.", serializer.data)
 
@@ -149,9 +402,14 @@ class ProductViewSet(viewsets.ModelViewSet):
         product = self.get_object()
         serializer = ProductImageUploadSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        product._image_file = serializer.validated_data['file']
-        product.save()
-        return api_response(True, "Product main image uploaded successfully.", {"main_image": product.main_image})
+        upload_to_cloudinary_in_background(
+            serializer.validated_data['file'], Product, product.pk, 'main_image',
+            folder="products/main", on_complete=lambda: _bump_list_cache_version(PRODUCT_LIST_CACHE)
+        )
+        return api_response(
+            True, "Product main image upload accepted.", {"main_image": product.main_image},
+            status_code=status.HTTP_202_ACCEPTED
+        )
 
 # =============================================================
 # PRODUCT VARIANT VIEWSET
@@ -239,6 +497,9 @@ class ProductImageViewSet(viewsets.ModelViewSet):
         serializer = ProductImageUploadSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        # Uploaded synchronously: a row is only created once its image exists, so
+        # a failed upload can't leave the product with a blank image. Updates
+        # run in the background because a failure there keeps the old image.
         image_instance = ProductImage(product=product)
         image_instance._image_file = serializer.validated_data["file"]
         image_instance.save()
@@ -258,13 +519,15 @@ class ProductImageViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = ProductImageUploadSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        instance._image_file = serializer.validated_data["file"]
-        instance.save()
+        upload_to_cloudinary_in_background(
+            serializer.validated_data["file"], ProductImage, instance.pk, "image",
+            folder="products/images"
+        )
         return api_response(
             True,
-            "Product image updated successfully.",
+            "Product image update accepted.",
             ProductImageSerializer(instance).data,
-            status_code=status.HTTP_200_OK,
+            status_code=status.HTTP_202_ACCEPTED,
         )
 
     # =============================================================
@@ -380,6 +643,7 @@ class CouponViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         coupon = serializer.save()
+        cache.delete(_coupon_cache_key(coupon.code))
         return api_response(True, "Coupon created successfully.", serializer.data, status_code=status.HTTP_201_CREATED)
 
     # =============================================================
@@ -397,9 +661,11 @@ class CouponViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
+        old_code = instance.code
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        cache.delete_many([_coupon_cache_key(old_code), _coupon_cache_key(instance.code)])
         return api_response(True, "Coupon updated successfully.", serializer.data)
 
     # =============================================================
@@ -415,6 +681,7 @@ class CouponViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.delete()
+        cache.delete(_coupon_cache_key(instance.code))
         return api_response(True, "Coupon deleted successfully.", None, status_code=status.HTTP_204_NO_CONTENT)
 
     # =============================================================
@@ -428,9 +695,8 @@ class CouponViewSet(viewsets.ModelViewSet):
         if not code:
             return api_response(False, "Coupon code is required.", None, status.HTTP_400_BAD_REQUEST)
 
-        try:
-            coupon = Coupon.objects.get(code=code, is_active=True)
-        except Coupon.DoesNotExist:
+        coupon = _get_coupon(code)
+        if coupon is None:
             return api_response(False, "Invalid coupon code.", None, status.HTTP_400_BAD_REQUEST)
 
         if not coupon.is_valid:
@@ -445,11 +711,67 @@ class CouponViewSet(viewsets.ModelViewSet):
 class CartViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticatedUser]
 
+    # =============================================================
+    # HELPER: prefetch active items with variant and product
+    # =============================================================
+    def _items_prefetch(self):
+        return Prefetch('items', queryset=CartItem.objects.select_related('variant__product'))
+
+    def _prefetch_items(self, cart):
+        if hasattr(cart, '_prefetched_objects_cache'):
+            cart._prefetched_objects_cache.pop('items', None)
+        prefetch_related_objects([cart], self._items_prefetch())
+        return cart
+
+    # =============================================================
+    # HELPER: get or create cart (memoized for the request)
+    # =============================================================
+    def _cart(self, request):
+        cart = getattr(request, '_cart', None)
+        if cart is None:
+            cart, _ = Cart.objects.get_or_create(user=request.user)
+            request._cart = cart
+        return cart
+
+    def _get_cart(self, request):
+        return self._prefetch_items(self._cart(request))
+
+    # =============================================================
+    # HELPER: lightweight cart summary for write responses
+    # =============================================================
+    def _cart_summary_dict(self, cart):
+        items = [item for item in cart.items.all() if item.is_active]
+        return {
+            'id': cart.id,
+            'items': [
+                {
+                    'id': item.id,
+                    'variant_id': item.variant_id,
+                    'quantity': item.quantity,
+                    'price': str(item.variant.price),
+                }
+                for item in items
+            ],
+            'subtotal': str(sum((item.total_price for item in items), Decimal('0'))),
+        }
+
+    # =============================================================
+    # HELPER: write response payload
+    # =============================================================
+    def _write_response_data(self, request, cart):
+        """
+        Write endpoints (add/update/remove/clear) only echo the cart id by default.
+        Pass ``?verbose=1`` to get the item summary and subtotal back as well.
+        """
+        if request.query_params.get('verbose') == '1':
+            return self._cart_summary_dict(self._prefetch_items(cart))
+        return {'cart_id': cart.id}
+
     # =============================================================
     # GET CART
     # =============================================================
     def list(self, request):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
+        cart = self._get_cart(request)
         serializer = CartSerializer(cart)
         return api_response(True, "Cart retrieved successfully.", serializer.data)
 
@@ -470,25 +792,35 @@ class CartViewSet(viewsets.ViewSet):
         except ValueError:
             return api_response(False, "Quantity must be a positive integer.", None, status.HTTP_400_BAD_REQUEST)
 
-        variant = get_object_or_404(ProductVariant, pk=variant_id)
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-
-        cart_item, created = CartItem.all_objects.get_or_create(
-            cart=cart,
-            variant=variant,
-            defaults={"quantity": quantity, "is_active": True}
+        variant = get_object_or_404(
+            ProductVariant.objects.only('id', 'price', 'stock', 'track_inventory'), pk=variant_id
         )
+        cart = self._cart(request)
+
+        # Common case: the item is already in the cart, bump it in one UPDATE.
+        # The stock guard mirrors CartItem.clean(); misses fall through to the
+        # full path below, which validates and raises as before.
+        existing = CartItem.objects.filter(cart=cart, variant=variant)
+        if variant.track_inventory:
+            existing = existing.filter(quantity__lte=variant.stock - quantity)
+        updated = existing.update(quantity=F('quantity') + quantity, updated_at=timezone.now())
+
+        if not updated:
+            cart_item, created = CartItem.all_objects.get_or_create(
+                cart=cart,
+                variant=variant,
+                defaults={"quantity": quantity, "is_active": True}
+            )
 
-        if not created:
-            if not cart_item.is_active:
-                cart_item.restore()
-                cart_item.quantity = quantity
-            else:
-                cart_item.quantity += quantity
-            cart_item.save(update_fields=['quantity', 'is_active', 'deleted_at'])
+            if not created:
+                if not cart_item.is_active:
+                    cart_item.restore()
+                    cart_item.quantity = quantity
+                else:
+                    cart_item.quantity += quantity
+                cart_item.save(update_fields=['quantity', 'is_active', 'deleted_at'])
 
-        serializer = CartSerializer(cart)
-        return api_response(True, "Item added to cart successfully.", serializer.data)
+        return api_response(True, "Item added to cart successfully.", self._write_response_data(request, cart))
 
     # =============================================================
     # UPDATE ITEM QUANTITY
@@ -505,8 +837,11 @@ class CartViewSet(viewsets.ViewSet):
         except ValueError:
             return api_response(False, "Quantity must be an integer.", None, status.HTTP_400_BAD_REQUEST)
 
-        cart = get_object_or_404(Cart, user=request.user)
-        cart_item = get_object_or_404(CartItem.all_objects, cart=cart, variant_id=variant_id)
+        cart_item = get_object_or_404(
+            CartItem.all_objects.select_related('cart', 'variant'),
+            cart__user=request.user, variant_id=variant_id
+        )
+        cart = cart_item.cart
 
         if quantity <= 0:
             cart_item.delete()
@@ -516,8 +851,7 @@ class CartViewSet(viewsets.ViewSet):
                 cart_item.restore()
             cart_item.save(update_fields=['quantity', 'is_active', 'deleted_at'])
 
-        serializer = CartSerializer(cart)
-        return api_response(True, "Cart updated successfully.", serializer.data)
+        return api_response(True, "Cart updated successfully.", self._write_response_data(request, cart))
 
     # =============================================================
     # REMOVE ITEM FROM CART
@@ -529,12 +863,14 @@ class CartViewSet(viewsets.ViewSet):
         if not variant_id:
             return api_response(False, "Variant ID is required.", None, status.HTTP_400_BAD_REQUEST)
 
-        cart = get_object_or_404(Cart, user=request.user)
-        cart_item = get_object_or_404(CartItem.all_objects, cart=cart, variant_id=variant_id)
+        cart_item = get_object_or_404(
+            CartItem.all_objects.select_related('cart', 'variant'),
+            cart__user=request.user, variant_id=variant_id
+        )
+        cart = cart_item.cart
         cart_item.delete()
 
-        serializer = CartSerializer(cart)
-        return api_response(True, "Item removed from cart successfully.", serializer.data)
+        return api_response(True, "Item removed from cart successfully.", self._write_response_data(request, cart))
 
     # =============================================================
     # CLEAR CART
@@ -542,12 +878,10 @@ class CartViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['DELETE'], url_path='clear')
     @transaction.atomic
     def clear_cart(self, request):
-        cart = get_object_or_404(Cart, user=request.user)
-        for item in cart.items.all():
-            item.delete()
+        cart = self._cart(request)
+        cart.items.filter(is_active=True).update(is_active=False, deleted_at=timezone.now())
 
-        serializer = CartSerializer(cart)
-        return api_response(True, "Cart cleared successfully.", serializer.data)
+        return api_response(True, "Cart cleared successfully.", self._write_response_data(request, cart))
 
     # =============================================================
     # CHECKOUT CART
@@ -558,35 +892,48 @@ class CartViewSet(viewsets.ViewSet):
         serializer = CheckoutSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        cart = get_object_or_404(Cart, user=request.user)
-        if not cart.items.filter(is_active=True).exists():
-            return api_response(False, "Cart is empty.", None, status.HTTP_400_BAD_REQUEST)
-
-        address = get_object_or_404(Address, id=serializer.validated_data['address_id'], user=request.user)
+        # Resolve the cheap lookups first so bad input fails before the cart is loaded.
+        # The order only needs the address id, and coupons come from the cache.
+        address = get_object_or_404(
+            Address.objects.only('id'), id=serializer.validated_data['address_id'], user=request.user
+        )
         coupon_code = serializer.validated_data.get('coupon_code')
-
-        subtotal = cart.subtotal()
-        discount_amount = Decimal('0')
         coupon = None
-
         if coupon_code:
-            try:
-                coupon = Coupon.objects.get(code=coupon_code, is_active=True)
-                discount_amount = Decimal(coupon.calculate_discount(subtotal))
-            except Coupon.DoesNotExist:
+            coupon = _get_coupon(coupon_code)
+            if coupon is None:
                 return api_response(False, "Invalid coupon code.", None, status.HTTP_400_BAD_REQUEST)
 
+        cart = self._get_cart(request)
+        active_items = list(cart.items.all())
+        if not active_items:
+            return api_response(False, "Cart is empty.", None, status.HTTP_400_BAD_REQUEST)
+
+        subtotal = cart.items.filter(is_active=True).aggregate(
+            total=Sum(F('quantity') * F('variant__price'), output_field=DecimalField())
+        )['total'] or Decimal('0')
+        discount_amount = Decimal('0')
+        if coupon:
+            discount_amount = Decimal(coupon.calculate_discount(subtotal))
+            if discount_amount <= 0:
+                # Expired or below min_order_value: don't spend a use on no discount.
+                coupon = None
+
         TAX_RATE = Decimal('0.18')
         SHIPPING_COST = Decimal('50')
         tax_amount = subtotal * TAX_RATE
         total_amount = subtotal - discount_amount + tax_amount + SHIPPING_COST
 
-        variant_ids = [item.variant.id for item in cart.items.filter(is_active=True)]
-        variants = ProductVariant.objects.select_for_update().filter(id__in=variant_ids)
-        variant_map = {v.id: v for v in variants}
+        variant_ids = [item.variant_id for item in active_items]
+        # Only inventory-tracked rows need a lock; the rest are read without one.
+        variants = ProductVariant.objects.select_related('product').filter(id__in=variant_ids)
+        locked = variants.select_for_update(of=('self',)).filter(track_inventory=True)
+        unlocked = variants.filter(track_inventory=False)
+        variant_map = {v.id: v for v in locked}
+        variant_map.update((v.id, v) for v in unlocked)
 
-        for item in cart.items.filter(is_active=True):
-            variant = variant_map[item.variant.id]
+        for item in active_items:
+            variant = variant_map[item.variant_id]
             if variant.track_inventory and item.quantity > variant.stock:
                 return api_response(
                     False,
@@ -595,6 +942,20 @@ class CartViewSet(viewsets.ViewSet):
                     status.HTTP_400_BAD_REQUEST
                 )
 
+        if coupon:
+            # Claim a use with a conditional UPDATE: the cached coupon may be stale
+            # and concurrent checkouts race for the same remaining uses.
+            now = timezone.now()
+            claimed = Coupon.objects.filter(
+                pk=coupon.pk, is_active=True, used_count__lt=F('usage_limit'),
+                valid_from__lte=now, valid_to__gte=now
+            ).update(used_count=F('used_count') + 1)
+            if not claimed:
+                return api_response(False, "Coupon is no longer available.", None, status.HTTP_400_BAD_REQUEST)
+            # After commit, so a concurrent lookup cannot re-cache the pre-commit row.
+            coupon_key = _coupon_cache_key(coupon.code)
+            transaction.on_commit(lambda: cache.delete(coupon_key))
+
         order = Order.objects.create(
             user=request.user,
             address=address,
@@ -606,20 +967,26 @@ class CartViewSet(viewsets.ViewSet):
             total_amount=total_amount
         )
 
-        for item in cart.items.filter(is_active=True):
-            variant = variant_map[item.variant.id]
-            OrderItem.objects.create(
+        order_items = []
+        decrements = {}
+        for item in active_items:
+            variant = variant_map[item.variant_id]
+            order_items.append(OrderItem(
                 order=order,
                 variant=variant,
                 quantity=item.quantity,
                 price=variant.price
-            )
+            ))
             if variant.track_inventory:
-                variant.stock -= item.quantity
-                variant.save(update_fields=['stock'])
+                decrements[variant.id] = decrements.get(variant.id, 0) - item.quantity
+
+        OrderItem.objects.bulk_create(order_items, batch_size=500)
+        # Runs under the row locks taken above.
+        _apply_stock_deltas(decrements)
 
         cart.items.all().delete()
 
+        prefetch_related_objects([order], _order_items_prefetch())
         serializer = OrderSerializer(order)
         return api_response(True, "Checkout successful.", serializer.data)
 
@@ -641,34 +1008,28 @@ class PaymentViewSet(viewsets.ModelViewSet):
     # =============================================================
     @action(detail=False, methods=["POST"], url_path="create-razorpay-order")
     def create_razorpay_order(self, request):
-        order_id = request.data.get("order_id")
-        order = Order.objects.get(id=order_id, user=request.user)
-        amount = float(order.total_amount)
-
-        payment, created = Payment.objects.get_or_create(
-            order=order,
-            defaults={
-                "user": request.user,
-                "method": "RAZORPAY",
-                "amount": amount,
-                "status": "PENDING",
-                "transaction_id": ""
-            }
+        return _idempotent_response(
+            request, "razorpay-order", lambda: self._create_razorpay_order(request)
         )
 
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-        razorpay_order = client.order.create({
-            "amount": int(amount * 100),
+    @transaction.atomic
+    def _create_razorpay_order(self, request):
+        order_id = request.data.get("order_id")
+        order, payment = _lock_order_payment(request.user, order_id, "RAZORPAY")
+        amount_minor = _to_minor_units(order.total_amount)
+
+        razorpay_order = RAZORPAY_CLIENT.order.create({
+            "amount": amount_minor,
             "currency": "INR",
             "payment_capture": 1
         })
         payment.transaction_id = razorpay_order["id"]
-        payment.save()
+        payment.save(update_fields=['transaction_id', 'updated_at'])
 
         return api_response(True, "Razorpay order created successfully.", {
             "razorpay_order_id": razorpay_order["id"],
             "razorpay_key": settings.RAZORPAY_KEY_ID,
-            "amount": int(amount * 100),
+            "amount": amount_minor,
             "currency": "INR",
         })
 
@@ -684,9 +1045,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
         if not all([payment_id, order_id, signature]):
             return api_response(False, "All Razorpay fields are required.", None, status.HTTP_400_BAD_REQUEST)
 
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
         try:
-            client.utility.verify_payment_signature({
+            RAZORPAY_CLIENT.utility.verify_payment_signature({
                 "razorpay_order_id": order_id,
                 "razorpay_payment_id": payment_id,
                 "razorpay_signature": signature
@@ -694,18 +1054,10 @@ class PaymentViewSet(viewsets.ModelViewSet):
         except razorpay.errors.SignatureVerificationError:
             return api_response(False, "Invalid Razorpay signature.", None, status.HTTP_400_BAD_REQUEST)
 
-        payment = Payment.objects.get(transaction_id=order_id)
-        if payment.status == "SUCCESS":
+        payment = _confirm_payment(order_id, transaction_id=payment_id)
+        if payment is None:
             return api_response(False, "Payment already processed.", None, status.HTTP_400_BAD_REQUEST)
 
-        payment.status = "SUCCESS"
-        payment.transaction_id = payment_id
-        payment.paid_at = timezone.now()
-        payment.save()
-
-        payment.order.status = "CONFIRMED"
-        payment.order.save()
-
         return api_response(True, "Razorpay payment verified successfully.", PaymentSerializer(payment).data)
 
     # =============================================================
@@ -713,29 +1065,23 @@ class PaymentViewSet(viewsets.ModelViewSet):
     # =============================================================
     @action(detail=False, methods=["POST"], url_path="create-stripe-order")
     def create_stripe_order(self, request):
-        order_id = request.data.get("order_id")
-        order = Order.objects.get(id=order_id, user=request.user)
-        amount = float(order.total_amount)
-
-        payment, created = Payment.objects.get_or_create(
-            order=order,
-            defaults={
-                "user": request.user,
-                "method": "STRIPE",
-                "amount": amount,
-                "status": "PENDING",
-                "transaction_id": ""
-            }
+        return _idempotent_response(
+            request, "stripe-order", lambda: self._create_stripe_order(request)
         )
 
-        stripe.api_key = settings.STRIPE_SECRET_KEY
+    @transaction.atomic
+    def _create_stripe_order(self, request):
+        order_id = request.data.get("order_id")
+        order, payment = _lock_order_payment(request.user, order_id, "STRIPE")
+        amount_minor = _to_minor_units(order.total_amount)
+
         session = stripe.checkout.Session.create(
             payment_method_types=["card"],
             line_items=[{
                 "price_data": {
                     "currency": "usd",
                     "product_data": {"name": f"Order #{order.id}"},
-                    "unit_amount": int(amount * 100),
+                    "unit_amount": amount_minor,
                 },
                 "quantity": 1,
             }],
@@ -745,7 +1091,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
         )
 
         payment.transaction_id = session.id
-        payment.save()
+        payment.save(update_fields=['transaction_id', 'updated_at'])
 
         return api_response(True, "Stripe session created successfully.", {
             "session_id": session.id,
@@ -761,24 +1107,48 @@ class PaymentViewSet(viewsets.ModelViewSet):
         if not session_id:
             return api_response(False, "Stripe session_id is required.", None, status.HTTP_400_BAD_REQUEST)
 
-        stripe.api_key = settings.STRIPE_SECRET_KEY
         session = stripe.checkout.Session.retrieve(session_id)
-        payment = Payment.objects.get(transaction_id=session.id)
+        if session.payment_status != "paid":
+            return api_response(False, "Stripe payment not completed.", None, status.HTTP_400_BAD_REQUEST)
 
-        if payment.status == "SUCCESS":
+        payment = _confirm_payment(session.id)
+        if payment is None:
             return api_response(False, "Payment already processed.", None, status.HTTP_400_BAD_REQUEST)
 
-        if session.payment_status == "paid":
-            payment.status = "SUCCESS"
-            payment.paid_at = timezone.now()
-            payment.save()
+        return api_response(True, "Stripe payment verified successfully.", PaymentSerializer(payment).data)
 
-            payment.order.status = "CONFIRMED"
-            payment.order.save()
+    # =============================================================
+    # STRIPE WEBHOOK
+    # =============================================================
+    @action(
+        detail=False, methods=["POST"], url_path="stripe-webhook",
+        # Stripe calls from a handful of IPs, so per-IP throttling would reject
+        # deliveries; the signature check below is the guard.
+        permission_classes=[permissions.AllowAny], authentication_classes=[], throttle_classes=[]
+    )
+    def stripe_webhook(self, request):
+        if not settings.STRIPE_WEBHOOK_SECRET:
+            return api_response(False, "Stripe webhook is not configured.", None, status.HTTP_503_SERVICE_UNAVAILABLE)
 
-            return api_response(True, "Stripe payment verified successfully.", PaymentSerializer(payment).data)
-        else:
-            return api_response(False, "Stripe payment not completed.", None, status.HTTP_400_BAD_REQUEST)
+        try:
+            event = stripe.Webhook.construct_event(
+                request.body,
+                request.headers.get("Stripe-Signature", ""),
+                settings.STRIPE_WEBHOOK_SECRET
+            )
+        except (ValueError, stripe.SignatureVerificationError):
+            return api_response(False, "Invalid Stripe webhook signature.", None, status.HTTP_400_BAD_REQUEST)
+
+        # The signed event carries the session, so no call back to Stripe is needed.
+        if event.type == "checkout.session.completed":
+            session = event.data.object
+            if session.payment_status == "paid":
+                try:
+                    _confirm_payment(session.id)
+                except Payment.DoesNotExist:
+                    logger.warning(f"Stripe webhook for unknown session {session.id}")
+
+        return api_response(True, "Webhook received.")
 
 # =============================================================
 # ORDER VIEWSET
@@ -792,9 +1162,35 @@ class OrderViewSet(viewsets.ModelViewSet):
     # =============================================================
     def get_queryset(self):
         user = self.request.user
+        queryset = _orders_queryset()
         if user.is_staff:
-            return Order.objects.all() 
-        return Order.objects.filter(user=user) 
+            return queryset
+        return queryset.filter(user=user)
+
+    # =============================================================
+    # HELPER: compare-and-swap status transition
+    # =============================================================
+    def _transition(self, pk, from_status, to_status):
+        """
+        Moves the order from ``from_status`` (one status or a tuple of them) to
+        ``to_status`` in a single conditional UPDATE, so two concurrent requests
+        cannot both apply the transition. Returns the refreshed order, or None
+        if the order was not in ``from_status``.
+        """
+        from_statuses = (from_status,) if isinstance(from_status, str) else from_status
+        queryset = Order.objects.filter(pk=pk, status__in=from_statuses)
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        try:
+            updated = queryset.update(status=to_status, updated_at=timezone.now())
+        except (TypeError, ValueError, ValidationError):
+            updated = 0
+
+        order = self.get_object()
+        if not updated:
+            return None
+        queue_order_status_change(order.id, to_status)
+        return order
 
     # =============================================================
     # RETRIEVE ORDER
@@ -810,18 +1206,18 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['POST'], url_path='cancel')
     @transaction.atomic
     def cancel_order(self, request, pk=None):
-        order = self.get_object()
-        if order.status not in ['PENDING', 'CONFIRMED']:
+        # Only the request whose UPDATE flips the status restocks, so concurrent
+        # cancels can't return the items twice.
+        order = self._transition(pk, ('PENDING', 'CONFIRMED'), 'CANCELLED')
+        if order is None:
             return api_response(False, "Order cannot be cancelled.", None, status.HTTP_400_BAD_REQUEST)
 
-        order.status = 'CANCELLED'
-        order.save(update_fields=['status'])
-
+        # Items are already prefetched for the response; only (variant_id, quantity)
+        # is needed here, and _apply_stock_deltas skips untracked variants in SQL.
+        restock = defaultdict(int)
         for item in order.items.all():
-            variant = item.variant
-            if variant.track_inventory:
-                variant.stock += item.quantity
-                variant.save(update_fields=['stock'])
+            restock[item.variant_id] += item.quantity
+        _apply_stock_deltas(restock)
 
         return api_response(True, "Order cancelled successfully.", self.get_serializer(order).data)
 
@@ -831,12 +1227,9 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['POST'], permission_classes=[IsAdminOrSuperAdmin], url_path='confirm')
     @transaction.atomic
     def confirm_order(self, request, pk=None):
-        order = self.get_object()
-        if order.status != 'PENDING':
+        order = self._transition(pk, 'PENDING', 'CONFIRMED')
+        if order is None:
             return api_response(False, "Only pending orders can be confirmed.", None, status.HTTP_400_BAD_REQUEST)
-
-        order.status = 'CONFIRMED'
-        order.save(update_fields=['status'])
         return api_response(True, "Order confirmed successfully.", self.get_serializer(order).data)
 
     # =============================================================
@@ -858,6 +1251,10 @@ class OrderViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset()
         if status_filter:
             queryset = queryset.filter(status=status_filter.upper())
+        queryset = queryset.order_by('-created_at')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
         serializer = self.get_serializer(queryset, many=True)
         return api_response(True, "Filtered orders fetched successfully.", serializer.data)
     
@@ -867,12 +1264,9 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['POST'], permission_classes=[IsAdminOrSuperAdmin], url_path='ship')
     @transaction.atomic
     def ship_order(self, request, pk=None):
-        order = self.get_object()
-        if order.status != 'CONFIRMED':
+        order = self._transition(pk, 'CONFIRMED', 'SHIPPED')
+        if order is None:
             return api_response(False, "Only confirmed orders can be shipped.", None, status.HTTP_400_BAD_REQUEST)
-        
-        order.status = 'SHIPPED'
-        order.save(update_fields=['status'])
         return api_response(True, "Order shipped successfully.", self.get_serializer(order).data)
 
     # =============================================================
@@ -881,12 +1275,9 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['POST'], permission_classes=[IsAdminOrSuperAdmin], url_path='deliver')
     @transaction.atomic
     def deliver_order(self, request, pk=None):
-        order = self.get_object()
-        if order.status != 'SHIPPED':
+        order = self._transition(pk, 'SHIPPED', 'DELIVERED')
+        if order is None:
             return api_response(False, "Only shipped orders can be delivered.", None, status.HTTP_400_BAD_REQUEST)
-        
-        order.status = 'DELIVERED'
-        order.save(update_fields=['status'])
         return api_response(True, "Order delivered successfully.", self.get_serializer(order).data)
 
 # =============================================================
@@ -898,7 +1289,12 @@ class WishlistViewSet(viewsets.ViewSet):
     # =============================================================
     # HELPER: get or create wishlist
     # =============================================================
-    def _get_wishlist(self, user):
+    def _get_wishlist(self, user, prefetch=False):
+        if prefetch:
+            # get_or_create() drops prefetches on the returned instance, so filter first.
+            wishlist = Wishlist.objects.prefetch_related('variants').filter(user=user).first()
+            if wishlist is not None:
+                return wishlist
         wishlist, _ = Wishlist.objects.get_or_create(user=user)
         return wishlist
 
@@ -906,7 +1302,7 @@ class WishlistViewSet(viewsets.ViewSet):
     # GET USER WISHLIST
     # =============================================================
     def list(self, request):
-        wishlist = self._get_wishlist(request.user)
+        wishlist = self._get_wishlist(request.user, prefetch=True)
         serializer = WishlistSerializer(wishlist)
         return api_response(True, "Wishlist fetched successfully.", serializer.data)
 
@@ -962,9 +1358,19 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
     # =============================================================
     def get_queryset(self):
         product_id = self.kwargs.get('product_pk')
+        queryset = ProductReview.objects.filter(is_active=True)
         if product_id:
-            return ProductReview.objects.filter(product_id=product_id, is_active=True)
-        return ProductReview.objects.filter(is_active=True)
+            queryset = queryset.filter(product_id=product_id)
+        queryset = queryset.select_related('product')
+        if self.action not in ('list', 'retrieve'):
+            # Writes run full_clean(), which reads every field: a deferred one
+            # would cost an extra SELECT each.
+            return queryset
+        return queryset.only(
+            'id', 'rating', 'title', 'comment', 'is_approved',
+            'user_id', 'order_item_id', 'product__id', 'product__name',
+            'product__slug', 'product__main_image'
+        )
 
     # =============================================================
     # CREATE PRODUCT REVIEW
@@ -977,11 +1383,14 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        existing_review = ProductReview.objects.filter(user=request.user, product=product).first()
-        if existing_review:
+        # One active review per user/product is enforced by the database constraint.
+        try:
+            with transaction.atomic():
+                review = serializer.save(user=request.user, product=product)
+        except IntegrityError:
             return api_response(False, "You have already reviewed this product.", None, status.HTTP_400_BAD_REQUEST)
 
-        review = serializer.save(user=request.user, product=product)
+        _invalidate_product_rating(product.id)
         return api_response(True, "Review added successfully.", self.get_serializer(review).data, status.HTTP_201_CREATED)
 
     
@@ -1007,6 +1416,7 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
         serializer.save()
 
         instance.product.update_average_rating()
+        _invalidate_product_rating(instance.product_id)
 
         return api_response(True, "Review updated successfully.", serializer.data)
 
@@ -1021,6 +1431,7 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
 
         instance.delete()
         instance.product.update_average_rating()
+        _invalidate_product_rating(instance.product_id)
         return api_response(True, "Review deleted successfully.", None, status.HTTP_204_NO_CONTENT)
 
     # =============================================================
@@ -1028,7 +1439,10 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
     # =============================================================
     @action(detail=False, methods=['GET'], url_path='my-reviews')
     def my_reviews(self, request):
-        reviews = ProductReview.objects.filter(user=request.user, is_active=True)
+        reviews = ProductReview.objects.filter(user=request.user, is_active=True).select_related('product')
+        page = self.paginate_queryset(reviews)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
         serializer = self.get_serializer(reviews, many=True)
         return api_response(True, "Your reviews fetched successfully.", serializer.data)
 
@@ -1037,10 +1451,18 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
     # =============================================================
     @action(detail=True, methods=['POST'], permission_classes=[IsAdminOrSuperAdmin], url_path='restore')
     def restore_review(self, request, pk=None):
-        review = ProductReview.all_objects.get(pk=pk)
-        if review.is_active:
+        try:
+            with transaction.atomic():
+                updated = ProductReview.all_objects.filter(pk=pk, is_active=False).update(
+                    is_active=True, deleted_at=None, updated_at=timezone.now()
+                )
+        except IntegrityError:
+            return api_response(False, "User already has an active review for this product.", None, status.HTTP_400_BAD_REQUEST)
+
+        review = get_object_or_404(ProductReview.all_objects.select_related('product'), pk=pk)
+        if not updated:
             return api_response(False, "Review is already active.", None, status.HTTP_400_BAD_REQUEST)
-        review.restore()
+        _invalidate_product_rating(review.product_id)
         return api_response(True, "Review restored successfully.", self.get_serializer(review).data)
     
     # =============================================================
@@ -1052,7 +1474,12 @@ class ProductReviewViewSet(viewsets.ModelViewSet):
         if not product_id:
             return api_response(False, "Product ID is required.", None, status.HTTP_400_BAD_REQUEST)
 
-        product = get_object_or_404(Product, pk=product_id)
-        avg_rating = ProductReview.objects.filter(product=product, is_active=True).aggregate(models.Avg('rating'))['rating__avg'] or 0
-        return api_response(True, "Average rating fetched successfully.", {"product_id": product.id, "average_rating": avg_rating})
+        key = _product_rating_cache_key(product_id)
+        data = cache.get(key)
+        if data is None:
+            product = get_object_or_404(Product, pk=product_id)
+            avg_rating = ProductReview.objects.filter(product=product, is_active=True).aggregate(Avg('rating'))['rating__avg'] or 0
+            data = {"product_id": product.id, "average_rating": avg_rating}
+            cache.set(key, data, PRODUCT_RATING_CACHE_TIMEOUT)
+        return api_response(True, "Average rating fetched successfully.", data)
 
@@ -6,7 +6,8 @@ from .models import (
     Like,
     Bookmark,
     Follow,
-    Profile
+    Profile,
+    live_count
 )
 
 # =============================================================
@@ -23,15 +24,34 @@ class PostImageInline(admin.TabularInline):
 # =============================================================
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('id', 'title', 'author', 'is_public', 'likes_count', 'comments_count', 'bookmarks_count', 'created_at')
+    list_display = ('id', 'title', 'author', 'is_public', 'likes_total', 'comments_total', 'bookmarks_total', 'created_at')
     list_filter = ('is_public', 'created_at')
     search_fields = ('title', 'content', 'author__username')
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
     inlines = [PostImageInline]
     readonly_fields = ('likes_count', 'comments_count', 'bookmarks_count', 'created_at', 'updated_at')
 
     def get_queryset(self, request):
+        # Counts are computed in the list query instead of one COUNT(*) per row per column.
         qs = super().get_queryset(request)
-        return qs.select_related('author').prefetch_related('likes', 'comments', 'bookmarks')
+        return qs.annotate(
+            likes_count_db=live_count(Like, 'post'),
+            comments_count_db=live_count(Comment, 'post'),
+            bookmarks_count_db=live_count(Bookmark, 'post'),
+        )
+
+    @admin.display(description='Likes', ordering='likes_count_db')
+    def likes_total(self, obj):
+        return obj.likes_count_db
+
+    @admin.display(description='Comments', ordering='comments_count_db')
+    def comments_total(self, obj):
+        return obj.comments_count_db
+
+    @admin.display(description='Bookmarks', ordering='bookmarks_count_db')
+    def bookmarks_total(self, obj):
+        return obj.bookmarks_count_db
 
 
 # =============================================================
@@ -39,14 +59,27 @@ class PostAdmin(admin.ModelAdmin):
 # =============================================================
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ('id', 'author', 'post', 'content', 'parent', 'likes_count', 'replies_count', 'created_at')
+    list_display = ('id', 'author', 'post', 'content', 'parent', 'likes_total', 'replies_total', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('content', 'author__username', 'post__title')
+    list_select_related = ('author', 'post', 'parent')
+    autocomplete_fields = ('author', 'post', 'parent')
     readonly_fields = ('likes_count', 'replies_count', 'created_at', 'updated_at')
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('author', 'post', 'parent').prefetch_related('likes', 'replies')
+        return qs.annotate(
+            likes_count_db=live_count(Like, 'comment'),
+            replies_count_db=live_count(Comment, 'parent'),
+        )
+
+    @admin.display(description='Likes', ordering='likes_count_db')
+    def likes_total(self, obj):
+        return obj.likes_count_db
+
+    @admin.display(description='Replies', ordering='replies_count_db')
+    def replies_total(self, obj):
+        return obj.replies_count_db
 
 
 # =============================================================
@@ -0,0 +1,109 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+from social.models import Follow
+
+# =============================================================
+# FOLLOWEE IDS CACHE
+# =============================================================
+FOLLOWEE_IDS_CACHE_TIMEOUT = 60 * 60
+
+
+def followee_ids_cache_key(user_id):
+    return f"follow:{user_id}"
+
+
+def get_followee_ids(user):
+    """
+    Returns the ids of the active users ``user`` follows. Cached per user and
+    cleared by the signals whenever one of their follows changes or a followee
+    is (de)activated.
+    """
+    return cache.get_or_set(
+        followee_ids_cache_key(user.id),
+        lambda: list(
+            user.following.filter(followee__is_active=True).values_list('followee_id', flat=True)
+        ),
+        FOLLOWEE_IDS_CACHE_TIMEOUT
+    )
+
+
+def invalidate_followee_ids(*user_ids):
+    # After commit, so a concurrent feed request cannot re-cache the old rows.
+    keys = [followee_ids_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+# =============================================================
+# FOLLOWER / FOLLOWING IDS CACHE
+# =============================================================
+FOLLOW_IDS_CACHE_TIMEOUT = 60 * 10
+
+
+def follower_ids_cache_key(user_id):
+    return f"followers:{user_id}"
+
+
+def following_ids_cache_key(user_id):
+    return f"following:{user_id}"
+
+
+def get_follower_ids(user_id):
+    """
+    Returns the ids of the users following ``user_id``, cache-aside with a
+    short TTL. Cleared by the Follow signals on follow/unfollow.
+    """
+    return cache.get_or_set(
+        follower_ids_cache_key(user_id),
+        lambda: list(
+            Follow.objects.filter(followee_id=user_id, is_active=True).values_list('follower_id', flat=True)
+        ),
+        FOLLOW_IDS_CACHE_TIMEOUT
+    )
+
+
+def get_following_ids(user_id):
+    """
+    Returns the ids of the users ``user_id`` follows. Unlike get_followee_ids
+    this keeps deactivated followees, matching the following lists.
+    """
+    return cache.get_or_set(
+        following_ids_cache_key(user_id),
+        lambda: list(
+            Follow.objects.filter(follower_id=user_id, is_active=True).values_list('followee_id', flat=True)
+        ),
+        FOLLOW_IDS_CACHE_TIMEOUT
+    )
+
+
+def invalidate_follow_ids(follower_id, followee_id):
+    transaction.on_commit(lambda: cache.delete_many([
+        following_ids_cache_key(follower_id),
+        follower_ids_cache_key(followee_id),
+    ]))
+
+# =============================================================
+# PROFILE DATA CACHE
+# =============================================================
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+
+def _profile_version(user_id):
+    return cache.get_or_set(f"profile:{user_id}:version", time.time_ns(), None)
+
+
+def bump_profile_version(user_id):
+    """
+    Invalidates the cached profile of ``user_id`` by moving it to a new version.
+    Called for profile edits and for anything that changes its counts.
+    """
+    transaction.on_commit(lambda: cache.set(f"profile:{user_id}:version", time.time_ns(), None))
+
+
+def get_cached_profile_data(user_id, build_data):
+    key = f"profile:{user_id}:{_profile_version(user_id)}"
+    data = cache.get(key)
+    if data is None:
+        data = build_data()
+        cache.set(key, data, PROFILE_CACHE_TIMEOUT)
+    return data
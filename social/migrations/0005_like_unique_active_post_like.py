@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0004_delete_notification'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('post', 'liked_by'), name='unique_active_post_like'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# DRF's SearchFilter issues icontains lookups, which PostgreSQL runs as
+# UPPER(col::text) LIKE UPPER(%s); the indexes cover that exact expression.
+SEARCH_INDEXES = {
+    'prof_fn_trgm': 'first_name',
+    'prof_ln_trgm': 'last_name',
+    'prof_bio_trgm': 'bio',
+    'prof_loc_trgm': 'location',
+}
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in SEARCH_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON social_profile '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0006_follow_followee_follower_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -0,0 +1,21 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0008_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Trim(django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name')), output_field=models.CharField(max_length=61)),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['full_name'], name='profile_full_name_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+def create_tags_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS post_tags_gin ON social_post USING gin (tags jsonb_path_ops)'
+        )
+
+
+def drop_tags_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS post_tags_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0010_follow_no_self_follow'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='post',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='post_tags_gin', opclasses=['jsonb_path_ops']),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_tags_index, drop_tags_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counts(apps, schema_editor):
+    Follow = apps.get_model('social', 'Follow')
+    Profile = apps.get_model('social', 'Profile')
+    active = Follow.objects.filter(is_active=True, deleted_at__isnull=True)
+
+    def count_of(side):
+        rows = active.filter(**{side: OuterRef('owner_id')}).values(side).annotate(n=Count('pk')).values('n')
+        return Coalesce(Subquery(rows[:1]), Value(0))
+
+    Profile.objects.update(
+        followers_count=count_of('followee'),
+        following_count=count_of('follower'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0011_post_tags_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
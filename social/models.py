@@ -1,5 +1,10 @@
 import uuid
+from urllib.parse import quote_plus
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Greatest, Trim
 from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
 from accounts.models import User
@@ -23,12 +28,16 @@ class Post(BaseModel):
     content = models.TextField()
     tags = models.JSONField(default=list, blank=True)  
     is_public = models.BooleanField(default=True)
+    # Maintained by a PostgreSQL trigger (title weighted A, content B); see migration 0008.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=['author', 'created_at']),
             models.Index(fields=['deleted_at', 'created_at']),
             models.Index(fields=['is_public', 'created_at']),
+            GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+            GinIndex(fields=['tags'], name='post_tags_gin', opclasses=['jsonb_path_ops']),
         ]
         ordering = ['-created_at']
 
@@ -127,6 +136,15 @@ class Like(BaseModel):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="likes", null=True, blank=True)
     comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name="likes", null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'liked_by'],
+                condition=models.Q(is_active=True),
+                name='unique_active_post_like'
+            )
+        ]
+
     def __str__(self):
         target = self.post or self.comment
         return f"{self.liked_by} liked {target}"
@@ -173,24 +191,32 @@ class Follow(BaseModel):
 
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=['follower', 'followee'], name='unique_follow')
+            models.UniqueConstraint(fields=['follower', 'followee'], name='unique_follow'),
+            models.CheckConstraint(
+                condition=~models.Q(follower=models.F('followee')),
+                name='no_self_follow',
+                violation_error_message="Users cannot follow themselves"
+            ),
         ]
         indexes = [
             models.Index(fields=['follower', 'created_at']),
             models.Index(fields=['followee', 'created_at']),
+            # Partial: the lists, id caches and follow checks only read active rows.
+            models.Index(
+                fields=['follower', 'followee'],
+                condition=models.Q(is_active=True),
+                name='follow_active_by_follower'
+            ),
+            models.Index(
+                fields=['followee', 'follower'],
+                condition=models.Q(is_active=True),
+                name='follow_active_by_followee'
+            ),
         ]
 
     def __str__(self):
         return f"{self.follower} follows {self.followee}"
 
-    def clean(self):
-        if self.follower == self.followee:
-            raise ValidationError("Users cannot follow themselves")
-
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
-
 # =============================================================
 # PROFILE MODEL
 # =============================================================
@@ -201,6 +227,11 @@ class Profile(BaseModel):
     owner = models.OneToOneField(User, on_delete=models.CASCADE, related_name="social_profile")
     first_name = models.CharField(max_length=30, default="John")
     last_name = models.CharField(max_length=30, default="Doe")
+    full_name = models.GeneratedField(
+        expression=Trim(Concat('first_name', Value(' '), 'last_name')),
+        output_field=models.CharField(max_length=61),
+        db_persist=True,
+    )
     bio = models.TextField(blank=True, default="")
     dob = models.DateField(blank=True, null=True)
     location = models.CharField(max_length=100, blank=True, default="")
@@ -211,6 +242,11 @@ class Profile(BaseModel):
     website = models.URLField(blank=True, default="")
     is_verified = models.BooleanField(default=False)
     is_private = models.BooleanField(default=False)
+    # Kept in step by adjust_follow_counts() (FollowViewSet, Follow deletes); never written by save().
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('followers_count', 'following_count')
 
     _avatar_file = None
     _cover_file = None
@@ -219,51 +255,78 @@ class Profile(BaseModel):
         verbose_name = "Profile"
         verbose_name_plural = "Profiles"
         ordering = ["owner__username"]
+        indexes = [
+            models.Index(fields=['full_name'], name='profile_full_name_idx'),
+        ]
+        # Trigram indexes for the search fields are PostgreSQL-only and live in
+        # migration 0007_profile_search_trgm_indexes.
 
     def __str__(self):
         return f"{self.owner.username}'s profile"
 
+    @classmethod
+    def adjust_follow_counts(cls, follower_id, followee_id, delta):
+        """
+        Moves the follow counters of both sides by ``delta`` with F() updates,
+        never below zero.
+        """
+        cls.all_objects.filter(owner_id=followee_id).update(
+            followers_count=Greatest(F('followers_count') + delta, 0)
+        )
+        cls.all_objects.filter(owner_id=follower_id).update(
+            following_count=Greatest(F('following_count') + delta, 0)
+        )
+
     # =============================================================
     # Cached properties
     # =============================================================
-    @cached_property
-    def full_name(self) -> str:
-        return f"{self.first_name} {self.last_name}".strip()
-
     @cached_property
     def posts_count(self) -> int:
         return self.owner.posts.filter(deleted_at__isnull=True).count()
 
-    @cached_property
-    def followers_count(self) -> int:
-        return self.owner.followers.count()
-
-    @cached_property
-    def following_count(self) -> int:
-        return self.owner.following.count()
-
     @cached_property
     def cover_image_url(self) -> str:
         if self.cover_image:
             return self.cover_image
-        name = self.owner.username.replace(" ", "+")
-        return PLACEHOLDER_COVER_URL.format(name=name)
+        return PLACEHOLDER_COVER_URL.format(name=quote_plus(self.owner.username))
 
     @cached_property
     def avatar_url(self) -> str:
         if self.avatar:
             return self.avatar
-        name = self.owner.username.replace(" ", "+")
-        return PLACEHOLDER_AVATAR_URL.format(name=name)
+        return PLACEHOLDER_AVATAR_URL.format(name=quote_plus(self.owner.username))
 
     # =============================================================
     # Save method for uploading files to cloudinary
     # =============================================================
     def save(self, *args, **kwargs):
+        # The column is computed by the database; mirror it so the saved
+        # instance does not need a refresh before serialization.
+        self.full_name = f"{self.first_name} {self.last_name}".strip()
         if self._avatar_file:
             self.avatar = upload_to_cloudinary(self._avatar_file, folder="social/profile/avatars")
             self._avatar_file = None
         if self._cover_file:
             self.cover_image = upload_to_cloudinary(self._cover_file, folder="social/profile/covers")
             self._cover_file = None
+        # A full save would write back counters a concurrent follow just moved.
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and not f.generated and f.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
+
+# =============================================================
+# QUERY HELPERS
+# =============================================================
+def live_count(model, field):
+    """
+    Counts the live ``model`` rows whose ``field`` points at the outer row, in
+    a correlated subquery, so several counts on one queryset don't multiply
+    each other's joins.
+    """
+    counts = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        c=Count('pk')
+    ).values('c')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
@@ -1,5 +1,7 @@
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field
+from rest_framework.filters import SearchFilter
 from social.models import (
     Post, PostImage, Comment, Like, 
     Bookmark, Follow, Profile
@@ -21,6 +23,22 @@ class PostFilter(filters.FilterSet):
     def filter_tags(self, queryset, name, value):
         return queryset.filter(tags__contains=[value])
 
+# =============================================================
+# POST SEARCH FILTER
+# =============================================================
+class PostSearchFilter(SearchFilter):
+    """
+    Matches ``?search=`` against Post.search_vector through its GIN index on
+    PostgreSQL; other backends keep DRF's icontains search over search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+        query = SearchQuery(" ".join(terms), config='english', search_type='websearch')
+        return queryset.filter(search_vector=query)
+
 # =============================================================
 # PROFILE FILTER
 # =============================================================
@@ -42,9 +60,8 @@ class ProfileSerializer(serializers.ModelSerializer):
     avatar_url = serializers.ReadOnlyField()
     cover_image_url = serializers.ReadOnlyField()
     full_name = serializers.ReadOnlyField()
-    posts_count = serializers.ReadOnlyField()
-    followers_count = serializers.ReadOnlyField()
-    following_count = serializers.ReadOnlyField()
+    # Annotated by ProfileViewSet.get_queryset; falls back to the model's cached property otherwise.
+    posts_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Profile
@@ -77,21 +94,10 @@ class PostSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
     images = PostImageSerializer(many=True, read_only=True)
 
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    bookmarks_count = serializers.SerializerMethodField()
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_likes_count(self, obj):
-        return obj.likes_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_comments_count(self, obj):
-        return obj.comments_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_bookmarks_count(self, obj):
-        return obj.bookmarks_count
+    # Annotated by PostViewSet.get_queryset; fall back to the model's cached properties otherwise.
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    bookmarks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Post
@@ -107,19 +113,12 @@ class PostSerializer(serializers.ModelSerializer):
 # =============================================================
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(read_only=True)
-    replies_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    # Annotated by CommentViewSet.get_queryset; fall back to the model's cached properties otherwise.
+    replies_count = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
     
     post = serializers.PrimaryKeyRelatedField(read_only=True)
 
-    @extend_schema_field(serializers.IntegerField())
-    def get_replies_count(self, obj):
-        return obj.replies_count
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_likes_count(self, obj):
-        return obj.likes_count
-
     class Meta:
         model = Comment
         fields = [
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from social.cache import bump_profile_version, invalidate_follow_ids, invalidate_followee_ids
+from accounts.models import User
+from social.models import Follow, Post, Profile
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def clear_followee_ids(sender, instance, **kwargs):
+    invalidate_followee_ids(instance.follower_id)
+    invalidate_follow_ids(instance.follower_id, instance.followee_id)
+    bump_profile_version(instance.follower_id)
+    bump_profile_version(instance.followee_id)
+
+@receiver(post_delete, sender=Follow)
+def release_follow_counts(sender, instance, **kwargs):
+    # Hard deletes (admin bulk delete, delete(hard=True), user cascades) bypass
+    # FollowViewSet; a live follow still counted on both profiles is released here.
+    if instance.is_active and instance.deleted_at is None:
+        Profile.adjust_follow_counts(instance.follower_id, instance.followee_id, -1)
+
+@receiver(post_save, sender=User)
+def clear_followers_feed_ids(sender, instance, created, update_fields=None, **kwargs):
+    # Only saves that may flip is_active; login's update_fields=['last_login'] is skipped.
+    if created or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    # One on_commit callback and one delete_many, however many followers.
+    invalidate_followee_ids(*Follow.objects.filter(followee=instance).values_list('follower_id', flat=True))
+
+@receiver(post_save, sender=User)
+def clear_user_profile(sender, instance, created, update_fields=None, **kwargs):
+    # The cached profile renders owner.username; login's update_fields=['last_login'] is skipped.
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    bump_profile_version(instance.id)
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def clear_author_profile(sender, instance, **kwargs):
+    bump_profile_version(instance.author_id)
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def clear_profile(sender, instance, **kwargs):
+    bump_profile_version(instance.owner_id)
@@ -1,23 +1,71 @@
-from django.db import transaction
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from social.models import (
     Post, PostImage, Like, Bookmark, 
-    Profile, Comment, Follow
+    Profile, Comment, Follow, live_count
 )
 from social.serializers import (
     PostSerializer, PostImageSerializer, 
-    PostFilter, ProfileFilter, ProfileSerializer, 
+    PostFilter, PostSearchFilter, ProfileFilter, ProfileSerializer, 
     CommentSerializer, FollowSerializer
 )
+from social.cache import (
+    bump_profile_version, get_cached_profile_data, get_followee_ids, get_follower_ids, get_following_ids,
+    invalidate_follow_ids, invalidate_followee_ids
+)
 from core.utils import api_response
+from core.cloudinary import upload_many_to_cloudinary, upload_to_cloudinary_in_background
 from core.throttles import FreeAnonThrottle, FreeUserThrottle
 from core.permissions import IsOwnerOrAdmin
 from core.constants import LIKE_POST, COMMENT, LIKE_COMMENT, FOLLOW
 from accounts.models import User
 
+# =============================================================
+# POST QUERYSET HELPER
+# =============================================================
+def _with_post_data(queryset):
+    """
+    Adds what PostSerializer renders to a Post queryset: the author, the
+    images, and the like/comment/bookmark counts as annotations, which the
+    model's cached properties pick up.
+    """
+    return queryset.select_related('author').prefetch_related(
+        Prefetch('images', queryset=PostImage.objects.only('id', 'post_id', 'image'))
+    ).annotate(
+        likes_count=live_count(Like, 'post'),
+        comments_count=live_count(Comment, 'post'),
+        bookmarks_count=live_count(Bookmark, 'post'),
+    )
+
+# =============================================================
+# PROFILE QUERYSET HELPER
+# =============================================================
+# Columns ProfileSerializer reads (owner__username feeds the placeholder image URLs).
+# Keep in sync with the serializer, or every added field becomes a deferred load per row.
+PROFILE_LIST_FIELDS = (
+    'id', 'owner', 'owner__username', 'first_name', 'last_name', 'full_name', 'bio', 'dob',
+    'location', 'country_code', 'phone_number', 'avatar', 'cover_image', 'website',
+    'is_verified', 'is_private', 'followers_count', 'following_count',
+)
+
+def _with_profile_data(queryset):
+    """
+    Adds what ProfileSerializer renders to a Profile queryset: the owner and
+    the post count as an annotation. Follow counts are stored on the profile.
+    """
+    return queryset.select_related('owner').annotate(
+        posts_count=Count(
+            'owner__posts',
+            filter=Q(owner__posts__is_active=True, owner__posts__deleted_at__isnull=True)
+        ),
+    )
+
 # =============================================================
 # POST VIEWSET
 # =============================================================
@@ -27,6 +75,7 @@ class PostViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     throttle_classes = [FreeUserThrottle, FreeAnonThrottle]
 
+    filter_backends = [DjangoFilterBackend, PostSearchFilter, OrderingFilter]
     filterset_class = PostFilter
     search_fields = ['title', 'content']
     ordering_fields = ['created_at', 'updated_at', 'title']
@@ -41,7 +90,7 @@ class PostViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         if not user.is_staff:
             queryset = queryset.filter(Q(is_public=True) | Q(author=user))
-        return queryset.select_related('author').prefetch_related('images', 'likes', 'comments')
+        return _with_post_data(queryset)
 
     # -----------------------------
     # My posts
@@ -76,7 +125,6 @@ class PostViewSet(viewsets.ModelViewSet):
     # Upload images
     # -----------------------------
     @action(detail=True, methods=["post"])
-    @transaction.atomic
     def images(self, request, pk=None):
         post = self.get_object()
         if post.author != request.user:
@@ -85,14 +133,13 @@ class PostViewSet(viewsets.ModelViewSet):
         if not files:
             return api_response(False, "No images uploaded", status.HTTP_400_BAD_REQUEST)
 
-        images_data = []
         for f in files:
             if f.size > 5 * 1024 * 1024 or not f.content_type.startswith("image/"):
                 return api_response(False, "Invalid image file", status.HTTP_400_BAD_REQUEST)
-            post_image = PostImage(post=post)
-            post_image._image_file = f
-            post_image.save()
-            images_data.append(PostImageSerializer(post_image).data)
+
+        urls = upload_many_to_cloudinary(files, folder="social/posts/images")
+        post_images = PostImage.objects.bulk_create([PostImage(post=post, image=url) for url in urls])
+        images_data = PostImageSerializer(post_images, many=True).data
 
         return api_response(True, f"{len(images_data)} images uploaded successfully", images_data)
 
@@ -101,9 +148,8 @@ class PostViewSet(viewsets.ModelViewSet):
     # -----------------------------
     @action(detail=False, methods=["get"])
     def feed(self, request):
-        user = request.user
-        followees = user.following.filter(followee__is_active=True).values('followee')
-        posts = self.get_queryset().filter(author__in=followees)
+        followee_ids = get_followee_ids(request.user)
+        posts = self.get_queryset().filter(author_id__in=followee_ids)
         page = self.paginate_queryset(posts)
         serializer = self.get_serializer(page or posts, many=True)
         if page is not None:
@@ -117,10 +163,12 @@ class PostViewSet(viewsets.ModelViewSet):
     @transaction.atomic
     def like(self, request, pk=None):
         post = self.get_object()
-        if Like.objects.filter(post=post, liked_by=request.user, is_active=True).exists():
+        # unique_active_post_like rejects a second active like; no pre-check needed.
+        try:
+            with transaction.atomic():
+                Like.objects.create(post=post, liked_by=request.user)
+        except IntegrityError:
             return api_response(False, "Already liked", status.HTTP_400_BAD_REQUEST)
-
-        like = Like.objects.create(post=post, liked_by=request.user)
         return api_response(True, "Post liked successfully")
 
     # -----------------------------
@@ -143,21 +191,22 @@ class PostViewSet(viewsets.ModelViewSet):
     @transaction.atomic
     def bookmark(self, request, pk=None):
         post = self.get_object()
-        bookmark = Bookmark.objects.filter(post=post, bookmarked_by=request.user, is_active=True).first()
-        if bookmark:
-            bookmark.is_active = not bookmark.is_active
-            bookmark.save(update_fields=["is_active"])
-            message = "Bookmark removed" if not bookmark.is_active else "Bookmark added"
+        removed = Bookmark.objects.filter(
+            post=post, bookmarked_by=request.user, is_active=True
+        ).update(is_active=False, updated_at=timezone.now())
+        if removed:
+            message = "Bookmark removed"
         else:
             Bookmark.objects.create(post=post, bookmarked_by=request.user)
             message = "Post bookmarked successfully"
 
-        bookmarks_count = Bookmark.objects.filter(post=post, is_active=True).count()
+        # get_object() already annotated the count; adjust it instead of counting again.
+        bookmarks_count = post.bookmarks_count - removed if removed else post.bookmarks_count + 1
         return api_response(
             True,
             message,
             data={
-                "bookmarked": bookmark.is_active if bookmark else True,
+                "bookmarked": not removed,
                 "bookmarks_count": bookmarks_count,
             }
         )
@@ -173,10 +222,9 @@ class PostViewSet(viewsets.ModelViewSet):
             bookmarked_by=request.user,
             is_active=True
         ).exists()
-        bookmarks_count = Bookmark.objects.filter(post=post, is_active=True).count()
         return api_response(True, "Bookmark status fetched successfully", {
             "bookmarked": is_bookmarked,
-            "bookmarks_count": bookmarks_count
+            "bookmarks_count": post.bookmarks_count
         })
 
 # =============================================================
@@ -193,18 +241,35 @@ class ProfileViewSet(viewsets.GenericViewSet):
     ordering_fields = ['first_name', 'last_name', 'posts_count', 'followers_count', 'following_count', 'created_at']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        return _with_profile_data(super().get_queryset())
+
+    def _get_owner(self, user_id=None):
+        return get_object_or_404(User, id=user_id, is_active=True) if user_id else self.request.user
+
+    def _get_profile(self, user):
+        # Plain SELECT on the common path; get_or_create (and its savepoint) only when missing.
+        try:
+            return self.get_queryset().get(owner=user)
+        except Profile.DoesNotExist:
+            profile, _ = Profile.objects.get_or_create(owner=user)
+            return profile
+
     def get_object(self, user_id=None):
-        user = get_object_or_404(User, id=user_id, is_active=True) if user_id else self.request.user
-        profile, _ = Profile.objects.get_or_create(owner=user)
-        return profile
+        return self._get_profile(self._get_owner(user_id))
+
+    def _profile_data(self, user):
+        # Versioned per owner; social.signals bumps it on profile, post and follow writes.
+        return get_cached_profile_data(
+            user.id, lambda: self.get_serializer(self._get_profile(user)).data
+        )
 
     # -----------------------------
     # Retrieve profile
     # -----------------------------
     def retrieve(self, request, pk=None):
-        profile = self.get_object(pk)
-        serializer = self.get_serializer(profile)
-        return api_response(True, "Profile fetched successfully", serializer.data)
+        data = self._profile_data(self._get_owner(pk))
+        return api_response(True, "Profile fetched successfully", data)
 
     # -----------------------------
     # Update profile
@@ -222,9 +287,8 @@ class ProfileViewSet(viewsets.GenericViewSet):
     # -----------------------------
     @action(detail=False, methods=["get"])
     def me(self, request):
-        profile = self.get_object()
-        serializer = self.get_serializer(profile)
-        return api_response(True, "My profile fetched successfully", serializer.data)
+        data = self._profile_data(request.user)
+        return api_response(True, "My profile fetched successfully", data)
 
     # -----------------------------
     # Upload avatar
@@ -236,9 +300,14 @@ class ProfileViewSet(viewsets.GenericViewSet):
         avatar_file = request.FILES.get("avatar")
         if not avatar_file or not avatar_file.content_type.startswith("image/") or avatar_file.size > 5*1024*1024:
             return api_response(False, "Invalid avatar file", status.HTTP_400_BAD_REQUEST)
-        profile._avatar_file = avatar_file
-        profile.save()
-        return api_response(True, "Avatar uploaded successfully", {"avatar_url": profile.avatar_url})
+        upload_to_cloudinary_in_background(
+            avatar_file, Profile, profile.pk, 'avatar',
+            folder="social/profile/avatars", on_complete=lambda: bump_profile_version(profile.owner_id)
+        )
+        return api_response(
+            True, "Avatar upload accepted", {"avatar_url": profile.avatar_url},
+            status_code=status.HTTP_202_ACCEPTED
+        )
 
     # -----------------------------
     # Upload cover
@@ -250,9 +319,14 @@ class ProfileViewSet(viewsets.GenericViewSet):
         cover_file = request.FILES.get("cover")
         if not cover_file or not cover_file.content_type.startswith("image/") or cover_file.size > 5*1024*1024:
             return api_response(False, "Invalid cover file", status.HTTP_400_BAD_REQUEST)
-        profile._cover_file = cover_file
-        profile.save()
-        return api_response(True, "Cover uploaded successfully", {"cover_image_url": profile.cover_image_url})
+        upload_to_cloudinary_in_background(
+            cover_file, Profile, profile.pk, 'cover_image',
+            folder="social/profile/covers", on_complete=lambda: bump_profile_version(profile.owner_id)
+        )
+        return api_response(
+            True, "Cover upload accepted", {"cover_image_url": profile.cover_image_url},
+            status_code=status.HTTP_202_ACCEPTED
+        )
 
 # =============================================================
 # COMMENT VIEWSET
@@ -263,13 +337,22 @@ class CommentViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     throttle_classes = [FreeUserThrottle, FreeAnonThrottle]
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('author').annotate(
+            likes_count=live_count(Like, 'comment'),
+            replies_count=live_count(Comment, 'parent'),
+        )
+
     # -----------------------------
     # List comments for a post
     # -----------------------------
     def list(self, request, post_pk=None):
         post = get_object_or_404(Post, id=post_pk, is_active=True)
-        comments = post.comments.filter(parent__isnull=True, is_active=True)
-        serializer = self.get_serializer(comments, many=True)
+        comments = self.get_queryset().filter(post=post, parent__isnull=True)
+        page = self.paginate_queryset(comments)
+        serializer = self.get_serializer(page or comments, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return api_response(True, "Comments fetched successfully", serializer.data)
 
     # -----------------------------
@@ -287,7 +370,7 @@ class CommentViewSet(viewsets.GenericViewSet):
     # Retrieve a single comment
     # -----------------------------
     def retrieve(self, request, post_pk=None, pk=None):
-        comment = get_object_or_404(Comment, id=pk, post_id=post_pk, is_active=True)
+        comment = get_object_or_404(self.get_queryset(), id=pk, post_id=post_pk)
         serializer = self.get_serializer(comment)
         return api_response(True, "Comment fetched successfully", serializer.data)
 
@@ -317,8 +400,11 @@ class CommentViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["get"])
     def replies(self, request, post_pk=None, pk=None):
         parent_comment = get_object_or_404(Comment, id=pk, post_id=post_pk, is_active=True)
-        replies = parent_comment.replies.filter(is_active=True)
-        serializer = self.get_serializer(replies, many=True)
+        replies = self.get_queryset().filter(parent=parent_comment)
+        page = self.paginate_queryset(replies)
+        serializer = self.get_serializer(page or replies, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return api_response(True, "Replies fetched successfully", serializer.data)
     
         # -----------------------------
@@ -368,7 +454,8 @@ class CommentViewSet(viewsets.GenericViewSet):
 class FollowViewSet(viewsets.GenericViewSet):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
-    permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    # No action fetches a Follow through get_object, so there is no object check to run.
+    permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [FreeUserThrottle, FreeAnonThrottle]
 
     # -----------------------------
@@ -377,21 +464,28 @@ class FollowViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["post"], url_path="follow")
     @transaction.atomic
     def follow_user(self, request, pk: str = None):
-        followee = get_object_or_404(User, id=pk)
-        if followee == request.user:
+        if str(request.user.id) == str(pk):
             return api_response(False, "You cannot follow yourself", status.HTTP_400_BAD_REQUEST)
 
-        follow, created = Follow.objects.get_or_create(
-            follower=request.user,
-            followee=followee,
-            defaults={"is_active": True}
-        )
-        if not created and follow.is_active:
+        # all_objects: an unfollow soft-deletes the row, and unique_follow covers it too.
+        # Locked so two concurrent re-follows cannot both restore it and double count.
+        follow = Follow.all_objects.select_related('follower', 'followee').select_for_update(of=('self',)).filter(
+            follower=request.user, followee_id=pk
+        ).first()
+        if follow and follow.is_active and follow.deleted_at is None:
             return api_response(False, "Already following", status.HTTP_400_BAD_REQUEST)
-        elif not created:
-            follow.is_active = True
-            follow.save(update_fields=["is_active"])
-            
+        if follow:
+            follow.restore()
+        else:
+            # Only a first follow needs the user: to 404 on a bad id and for the response.
+            followee = get_object_or_404(User, id=pk)
+            try:
+                with transaction.atomic():
+                    follow = Follow.objects.create(follower=request.user, followee=followee)
+            except IntegrityError:
+                return api_response(False, "Already following", status.HTTP_400_BAD_REQUEST)
+        Profile.adjust_follow_counts(request.user.id, follow.followee_id, 1)
+
         serializer = self.get_serializer(follow)
         return api_response(True, "User followed successfully", serializer.data)
 
@@ -401,32 +495,44 @@ class FollowViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["delete"], url_path="unfollow")
     @transaction.atomic
     def unfollow_user(self, request, pk: str = None):
-        followee = get_object_or_404(User, id=pk)
-        follow = Follow.objects.filter(follower=request.user, followee=followee, is_active=True).first()
-        if not follow:
+        updated = Follow.objects.filter(follower=request.user, followee_id=pk, is_active=True).update(
+            is_active=False, deleted_at=timezone.now()
+        )
+        if not updated:
             return api_response(False, "You are not following this user", status.HTTP_400_BAD_REQUEST)
-        follow.soft_delete()
+        Profile.adjust_follow_counts(request.user.id, pk, -1)
+        # update() sends no post_save, so clear what the Follow signal would have.
+        invalidate_followee_ids(request.user.id)
+        invalidate_follow_ids(request.user.id, pk)
+        bump_profile_version(request.user.id)
+        bump_profile_version(pk)
         return api_response(True, "User unfollowed successfully")
 
+    # -----------------------------
+    # Shared follow-list helper
+    # -----------------------------
+    def _list_profiles(self, user_id, direction, message):
+        ids = get_follower_ids(user_id) if direction == "followers" else get_following_ids(user_id)
+        profiles = _with_profile_data(Profile.objects.filter(owner_id__in=ids)).only(*PROFILE_LIST_FIELDS)
+        page = self.paginate_queryset(profiles)
+        serializer = ProfileSerializer(profiles if page is None else page, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return api_response(True, message, serializer.data)
+
     # -----------------------------
     # Get my followers
     # -----------------------------
     @action(detail=False, methods=["get"], url_path="my_followers")
     def my_followers(self, request):
-        followers = Follow.objects.filter(followee=request.user, is_active=True).select_related("follower__social_profile")
-        profiles = [f.follower.social_profile for f in followers if hasattr(f.follower, "social_profile")]
-        serializer = ProfileSerializer(profiles, many=True)
-        return api_response(True, "My followers fetched successfully", serializer.data)
+        return self._list_profiles(request.user.id, "followers", "My followers fetched successfully")
 
     # -----------------------------
     # Get my following
     # -----------------------------
     @action(detail=False, methods=["get"], url_path="my_following")
     def my_following(self, request):
-        following = Follow.objects.filter(follower=request.user, is_active=True).select_related("followee__social_profile")
-        profiles = [f.followee.social_profile for f in following if hasattr(f.followee, "social_profile")]
-        serializer = ProfileSerializer(profiles, many=True)
-        return api_response(True, "My following fetched successfully", serializer.data)
+        return self._list_profiles(request.user.id, "following", "My following fetched successfully")
 
     # -----------------------------
     # Get followers of a user
@@ -434,10 +540,7 @@ class FollowViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["get"], url_path="followers")
     def user_followers(self, request, pk=None):
         user = get_object_or_404(User, id=pk)
-        followers = Follow.objects.filter(followee=user, is_active=True).select_related("follower__social_profile")
-        profiles = [f.follower.social_profile for f in followers if hasattr(f.follower, "social_profile")]
-        serializer = ProfileSerializer(profiles, many=True)
-        return api_response(True, f"{user.username}'s followers fetched successfully", serializer.data)
+        return self._list_profiles(user.id, "followers", f"{user.username}'s followers fetched successfully")
 
     # -----------------------------
     # Get following of a user
@@ -445,10 +548,7 @@ class FollowViewSet(viewsets.GenericViewSet):
     @action(detail=True, methods=["get"], url_path="following")
     def user_following(self, request, pk=None):
         user = get_object_or_404(User, id=pk)
-        following = Follow.objects.filter(follower=user, is_active=True).select_related("followee__social_profile")
-        profiles = [f.followee.social_profile for f in following if hasattr(f.followee, "social_profile")]
-        serializer = ProfileSerializer(profiles, many=True)
-        return api_response(True, f"{user.username}'s following fetched successfully", serializer.data)
+        return self._list_profiles(user.id, "following", f"{user.username}'s following fetched successfully")
 
 # =============================================================
 # BOOKMARK VIEWSET
@@ -463,6 +563,10 @@ class BookmarkViewSet(viewsets.GenericViewSet):
         return Bookmark.objects.filter(bookmarked_by=self.request.user, is_active=True).select_related('post')
 
     def list(self, request):
-        posts = Post.objects.filter(bookmarks__bookmarked_by=request.user, bookmarks__is_active=True).distinct()
-        serializer = self.get_serializer(posts, many=True)
+        bookmarked = Bookmark.objects.filter(post=OuterRef('pk'), bookmarked_by=request.user, is_active=True)
+        posts = _with_post_data(Post.objects.filter(Exists(bookmarked)))
+        page = self.paginate_queryset(posts)
+        serializer = self.get_serializer(posts if page is None else page, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return api_response(True, "Bookmarked posts fetched successfully", serializer.data)
@@ -0,0 +1,30 @@
+import hashlib
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+# =============================================================
+# TODO LIST CACHE
+# =============================================================
+TODO_LIST_CACHE_TIMEOUT = 60 * 5
+
+
+def _list_version(user_id):
+    return cache.get_or_set(f"todos:{user_id}:version", time.time_ns(), None)
+
+
+def todo_list_cache_key(user_id, url):
+    """
+    Key for one list page of ``user_id``. ``url`` is the absolute request URL,
+    so filters, ordering and cursor each get their own entry.
+    """
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f"todos:{user_id}:{_list_version(user_id)}:{digest}"
+
+
+def bump_todo_list_version(user_id):
+    """
+    Invalidates every cached list page of ``user_id`` by moving to a new
+    version. Runs after commit so a rolled-back write keeps the old pages.
+    """
+    transaction.on_commit(lambda: cache.set(f"todos:{user_id}:version", time.time_ns(), None))
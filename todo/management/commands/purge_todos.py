@@ -0,0 +1,49 @@
+"""
+===================================================================
+Soft-Deleted Todo Cleanup
+===================================================================
+Usage Example: python manage.py purge_todos --older-than 30
+===================================================================
+"""
+
+import logging
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from todo.models import Todo
+
+# ============================================================
+# LOGGER CONFIGURATION
+# ============================================================
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# DJANGO MANAGEMENT COMMAND
+# ============================================================
+class Command(BaseCommand):
+    """
+    Permanently deletes todos that were soft-deleted more than
+    ``--older-than`` days ago (30 by default). Until then a deleted todo
+    can still be restored; after the purge it is gone for good.
+    Meant to be scheduled (e.g. a nightly cron job).
+    """
+
+    help = "Permanently delete todos soft-deleted more than N days ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than", type=int, default=30, help="Retention window in days (default: 30)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows deleted per statement (default: 1000)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        expired = Todo.all_objects.filter(deleted_at__lt=cutoff)
+
+        # Deletes in batches so no single statement holds locks for long.
+        purged = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            deleted, _ = Todo.all_objects.filter(id__in=ids).delete()
+            purged += deleted
+        logger.info(f"Purged {purged} soft-deleted todos older than {options['older_than']} days.")
@@ -0,0 +1,17 @@
+import todo.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='todo',
+            name='expire_at',
+            field=models.DateTimeField(blank=True, default=todo.models.default_expire_at, help_text='Auto-expiry timestamp for cleanup', null=True),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0002_alter_todo_expire_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('is_active', True), ('deleted_at__isnull', True)), fields=['owner', '-created_at'], name='todo_owner_active_created_idx'),
+        ),
+    ]
@@ -1,9 +1,19 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connection, models
+from django.db.models.functions import Upper
 from core.models import BaseModel  
 from django.utils import timezone
 from core.constants import PRIORITY_CHOICES, PRIORITY_MEDIUM
 from datetime import timedelta
 from accounts.models import User
+from todo.cache import bump_todo_list_version
+
+TODO_EXPIRY = timedelta(days=7)
+
+
+def default_expire_at():
+    return timezone.now() + TODO_EXPIRY
+
 
 # =============================================================
 # TODO MODEL
@@ -23,7 +33,12 @@ class Todo(BaseModel):
         default=PRIORITY_MEDIUM, 
         help_text="Task priority"
     )
-    expire_at = models.DateTimeField(null=True, blank=True, help_text="Auto-expiry timestamp for cleanup")  
+    expire_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=default_expire_at,
+        help_text="Auto-expiry timestamp for cleanup"
+    )
 
     # =============================================================
     # Soft Delete Methods
@@ -32,8 +47,51 @@ class Todo(BaseModel):
         """
         Marks the todo as deleted by setting deleted_at timestamp.
         """
-        self.deleted_at = timezone.now()
-        self.save()
+        now = timezone.now()
+        Todo.all_objects.filter(pk=self.pk).update(deleted_at=now, updated_at=now)
+        self.deleted_at = self.updated_at = now
+        # update() sends no post_save, so the cached list pages are dropped here.
+        bump_todo_list_version(self.owner_id)
+
+    @classmethod
+    def bulk_soft_delete(cls, queryset):
+        """
+        Soft deletes every todo in ``queryset`` with a single UPDATE.
+        """
+        now = timezone.now()
+        return queryset.update(deleted_at=now, updated_at=now)
+
+    @classmethod
+    def bulk_restore(cls, queryset):
+        """
+        Restores every todo in ``queryset`` with a single UPDATE.
+        """
+        return queryset.update(is_active=True, deleted_at=None, updated_at=timezone.now())
+
+    @classmethod
+    def toggle_completed(cls, pk, owner_id):
+        """
+        Flips ``completed`` on the owner's live todo in a single
+        UPDATE ... RETURNING and returns the new value, or None if no live
+        todo matched. Raw SQL because the ORM's update() cannot return rows.
+        """
+        meta = cls._meta
+        quote = connection.ops.quote_name
+        sql = (
+            f"UPDATE {quote(meta.db_table)} SET completed = NOT completed, updated_at = %s "
+            f"WHERE id = %s AND owner_id = %s AND is_active = %s AND deleted_at IS NULL "
+            f"RETURNING completed"
+        )
+        params = [
+            meta.get_field("updated_at").get_db_prep_value(timezone.now(), connection),
+            meta.pk.get_db_prep_value(pk, connection),
+            meta.get_field("owner").target_field.get_db_prep_value(owner_id, connection),
+            True,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return None if row is None else bool(row[0])
 
     # =============================================================
     # Status Property
@@ -50,10 +108,11 @@ class Todo(BaseModel):
     # =============================================================
     def save(self, *args, **kwargs):
         """
-        Sets expire_at to 7 days from now if not already set.
+        Sets expire_at to 7 days from now if it was explicitly cleared.
+        New todos get it from the field default, which bulk_create applies too.
         """
         if self.expire_at is None:
-            self.expire_at = timezone.now() + timedelta(days=7)  
+            self.expire_at = default_expire_at()
         super().save(*args, **kwargs)
         
     # =============================================================
@@ -73,4 +132,13 @@ class Todo(BaseModel):
             models.Index(fields=['due_date']),
             models.Index(fields=['priority']),
             models.Index(fields=['completed']),
+            models.Index(
+                fields=['owner', '-created_at'],
+                condition=models.Q(is_active=True, deleted_at__isnull=True),
+                name='todo_owner_active_created_idx'
+            ),
+            # ?search= runs icontains, i.e. UPPER(col) LIKE UPPER('%q%'); trigram
+            # indexes on the same expression let PostgreSQL probe instead of scan.
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='todo_title_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='todo_description_trgm'),
         ]
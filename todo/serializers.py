@@ -1,25 +1,25 @@
 from rest_framework import serializers
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema_field
+from django_filters import rest_framework as filters
 from todo.models import Todo
 
 # =============================================================
-# Status Mixin
+# Filter
 # =============================================================
-class TodoStatusMixin(serializers.ModelSerializer):
-    """Provides a computed 'status' field for Todos"""
-    status = serializers.SerializerMethodField()
-
-    @extend_schema_field(serializers.CharField())
-    def get_status(self, obj) -> str:
-        return "Completed" if obj.completed else "Pending"
+class TodoFilter(filters.FilterSet):
+    """Declared once so the filter backend does not build one per request"""
+    class Meta:
+        model = Todo
+        fields = ["completed", "priority"]
 
 
 # =============================================================
 # List / Retrieve
 # =============================================================
-class TodoSerializer(TodoStatusMixin):
+class TodoSerializer(serializers.ModelSerializer):
     """Serializer for listing and retrieving Todos"""
+    status = serializers.CharField(read_only=True)
+
     class Meta:
         model = Todo
         fields = [
@@ -29,6 +29,19 @@ class TodoSerializer(TodoStatusMixin):
         read_only_fields = fields
 
 
+class TodoListSerializer(TodoSerializer):
+    """
+    Slim serializer for the list endpoint; description is left to retrieve.
+    The list feeds it .values() dicts with status annotated.
+    """
+    class Meta(TodoSerializer.Meta):
+        fields = [
+            "id", "title", "completed", "due_date", "priority",
+            "status", "created_at", "updated_at"
+        ]
+        read_only_fields = fields
+
+
 # =============================================================
 # Create / Update
 # =============================================================
@@ -63,6 +76,22 @@ class TodoPartialUpdateSerializer(serializers.ModelSerializer):
         extra_kwargs = {field: {"required": False} for field in fields}
 
 
+# =============================================================
+# Bulk Soft Delete / Restore
+# =============================================================
+TODO_BULK_MAX_IDS = 500
+
+
+class TodoBulkIdsSerializer(serializers.Serializer):
+    """Serializer for the ids of a bulk soft delete or restore"""
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=TODO_BULK_MAX_IDS,
+        help_text=f"Todo IDs (at most {TODO_BULK_MAX_IDS})"
+    )
+
+
 # =============================================================
 # Responses for Soft Delete / Restore / Toggle
 # =============================================================
@@ -79,3 +108,7 @@ class TodoRestoreResponseSerializer(serializers.Serializer):
 class ToggleStatusResponseSerializer(serializers.Serializer):
     id = serializers.UUIDField(help_text="Todo ID")
     completed = serializers.BooleanField(help_text="Current completion status")
+
+
+class TodoBulkResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField(help_text="Number of todos affected")
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from todo.cache import bump_todo_list_version
+from todo.models import Todo
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def clear_todo_list(sender, instance, **kwargs):
+    bump_todo_list_version(instance.owner_id)
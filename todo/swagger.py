@@ -3,7 +3,13 @@ from drf_spectacular.utils import (
     extend_schema,
     OpenApiResponse,
 )
-from todo.serializers import TodoCreateSerializer, TodoSerializer
+from todo.serializers import (
+    TodoBulkIdsSerializer,
+    TodoBulkResponseSerializer,
+    TodoCreateSerializer,
+    TodoListSerializer,
+    TodoSerializer,
+)
 
 # =============================================================
 # Todo Create Swagger
@@ -78,14 +84,12 @@ todo_list_success_example = OpenApiExample(
     name="Todo List Success Response",
     summary="Example response when retrieving a list of Todos",
     value={
-        "count": 1,
         "next": None,
         "previous": None,
         "results": [
             {
                 "id": "2fe31e3f-2ca0-4395-a8ef-6b670b0ac923",
                 "title": "Learn DRF",
-                "description": "Build a Todo API",
                 "completed": False,
                 "due_date": None,
                 "priority": "Medium",
@@ -105,17 +109,35 @@ todo_list_schema = extend_schema(
     request=None,
     responses={
         200: OpenApiResponse(
-            response=TodoSerializer(many=True),
+            response=TodoListSerializer(many=True),
             description="List of all Todos",
             examples=[todo_list_success_example],
         )
     },
     description=(
-        "Retrieve a paginated list of all Todo items. "
-        "Supports filters, ordering, and pagination as per Django REST framework settings."
+        "Retrieve a cursor-paginated list of all Todo items, 25 per page, without descriptions "
+        "(fetch a single Todo for its description). "
+        "Follow the `next`/`previous` links to page; supports filters and ordering by created_at/updated_at."
     ),
 )   
 
+# =============================================================
+# Todo Export Swagger
+# =============================================================
+todo_export_schema = extend_schema(
+    request=None,
+    responses={
+        200: OpenApiResponse(
+            response=TodoSerializer(many=True),
+            description="JSON array of every matching Todo, streamed.",
+        )
+    },
+    description=(
+        "Stream all Todo items as a single JSON array, unpaginated and with descriptions. "
+        "Accepts the same filters, search and ordering as the list endpoint."
+    ),
+)
+
 # =============================================================
 # Todo Retrieve Swagger
 # =============================================================
@@ -330,4 +352,83 @@ todo_restore_schema = extend_schema(
         "Restore a previously deleted Todo item by its ID. "
         "Returns the ID of the restored Todo and a success message."
     ),
-)
\ No newline at end of file
+)
+
+# =============================================================
+# Todo Bulk Delete / Restore Swagger
+# =============================================================
+
+# ----------------------------
+# Request Example
+# ----------------------------
+todo_bulk_request_example = OpenApiExample(
+    name="Todo Bulk Request",
+    summary="Example payload listing the Todos to delete or restore",
+    value={
+        "ids": [
+            "2fe31e3f-2ca0-4395-a8ef-6b670b0ac923",
+            "8b0c6f0e-52f4-4a39-9a43-2d1f2a8a6f01"
+        ]
+    },
+    request_only=True
+)
+
+# ----------------------------
+# Response Examples
+# ----------------------------
+todo_bulk_delete_success_example = OpenApiExample(
+    name="Todo Bulk Delete Success Response",
+    summary="Example response after deleting several Todos",
+    value={
+        "success": True,
+        "message": "Todos deleted successfully",
+        "data": {"count": 2}
+    },
+    response_only=True
+)
+
+todo_bulk_restore_success_example = OpenApiExample(
+    name="Todo Bulk Restore Success Response",
+    summary="Example response after restoring several Todos",
+    value={
+        "success": True,
+        "message": "Todos restored successfully",
+        "data": {"count": 2}
+    },
+    response_only=True
+)
+
+# ----------------------------
+# Extend Schema for Bulk Delete / Restore APIs
+# ----------------------------
+todo_bulk_delete_schema = extend_schema(
+    request=TodoBulkIdsSerializer,
+    examples=[todo_bulk_request_example],
+    responses={
+        200: OpenApiResponse(
+            response=TodoBulkResponseSerializer,
+            description="Todos deleted successfully.",
+            examples=[todo_bulk_delete_success_example],
+        )
+    },
+    description=(
+        "Delete up to 500 Todo items by ID in one request. "
+        "IDs that are unknown or already deleted are skipped; returns how many were deleted."
+    ),
+)
+
+todo_bulk_restore_schema = extend_schema(
+    request=TodoBulkIdsSerializer,
+    examples=[todo_bulk_request_example],
+    responses={
+        200: OpenApiResponse(
+            response=TodoBulkResponseSerializer,
+            description="Todos restored successfully.",
+            examples=[todo_bulk_restore_success_example],
+        )
+    },
+    description=(
+        "Restore up to 500 deleted Todo items by ID in one request. "
+        "IDs that are unknown or not deleted are skipped; returns how many were restored."
+    ),
+)
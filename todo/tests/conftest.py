@@ -0,0 +1,32 @@
+import logging
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+# =============================================================
+# FAST PASSWORD HASHING
+# =============================================================
+@pytest.fixture(scope="package", autouse=True)
+def fast_password_hasher():
+    """Todo tests authenticate with force_authenticate, so the hash strength is irrelevant."""
+    with override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+        yield
+
+# =============================================================
+# QUIET LOGGING
+# =============================================================
+@pytest.fixture(scope="package", autouse=True)
+def silence_logging():
+    """The views log every action; none of the todo tests assert on it."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+# =============================================================
+# CACHE ISOLATION
+# =============================================================
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """List pages are cached per user; setUpTestData users are shared across tests."""
+    cache.clear()
+    yield
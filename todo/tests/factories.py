@@ -1,9 +1,17 @@
 import factory
+from functools import cache
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
 from todo.models import Todo
 from accounts.models import User
 from core.constants import PRIORITY_MEDIUM
 
+@cache
+def _test_password_hash():
+    # Hashed once per run; set_password per user would re-run the slow hasher every time.
+    return make_password("testpass123")
+
+
 # =============================================================
 # USER FACTORY
 # =============================================================
@@ -14,7 +22,7 @@ class UserFactory(factory.django.DjangoModelFactory):
         skip_postgeneration_save = True
     username = factory.Sequence(lambda n: f"user_{n}")
     email = factory.LazyAttribute(lambda obj: f"{obj.username}@example.com")
-    password = factory.PostGenerationMethodCall("set_password", "testpass123")
+    password = factory.LazyFunction(_test_password_hash)
 
 # =============================================================
 # TODO FACTORY
@@ -26,6 +34,26 @@ class TodoFactory(factory.django.DjangoModelFactory):
     description = factory.Faker("sentence", nb_words=6)
     completed = False
     priority = PRIORITY_MEDIUM
-    expire_at = None
     owner = factory.SubFactory(UserFactory)
     due_date = factory.LazyFunction(lambda: timezone.now() + timezone.timedelta(days=7))
+
+    @classmethod
+    def bulk_create_batch(cls, size, **kwargs):
+        """
+        Builds ``size`` todos and inserts them with one bulk_create. They share
+        one owner (created once unless passed in) and skip Todo.save().
+        """
+        if "owner" not in kwargs:
+            kwargs["owner"] = UserFactory()
+        return Todo.objects.bulk_create(cls.build_batch(size, **kwargs), batch_size=1000)
+
+
+# =============================================================
+# BULK HELPERS
+# =============================================================
+def make_todos(user, specs):
+    """
+    Inserts one todo per dict in ``specs`` for ``user`` with a single
+    bulk_create and returns them in the same order.
+    """
+    return Todo.objects.bulk_create([TodoFactory.build(owner=user, **spec) for spec in specs])
@@ -0,0 +1,20 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from todo.models import Todo
+from .factories import TodoFactory
+
+@pytest.mark.django_db
+class TestPurgeTodosCommand:
+    """Tests for the purge_todos management command"""
+    def test_purges_only_expired_soft_deleted_todos(self):
+        live = TodoFactory()
+        recent = TodoFactory(deleted_at=timezone.now() - timedelta(days=1))
+        expired = TodoFactory(deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command("purge_todos", "--older-than", "30", "--batch-size", "1")
+
+        remaining = set(Todo.all_objects.values_list("id", flat=True))
+        assert remaining == {live.id, recent.id}
+        assert expired.id not in remaining
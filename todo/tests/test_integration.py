@@ -1,7 +1,7 @@
 import pytest
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase
 from todo.models import Todo
 from .factories import UserFactory, TodoFactory
 
@@ -9,11 +9,14 @@ from .factories import UserFactory, TodoFactory
 class TestTodoAPIWorkflow(APITestCase):
     """End-to-end API workflow tests for TodoViewSet"""
 
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class; TestCase rolls each test back to this state.
+        cls.user = UserFactory()
+        cls.base_url = reverse("todo:todo-list")
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = UserFactory()
         self.client.force_authenticate(user=self.user)
-        self.base_url = reverse("todo:todo-list")
 
     # =============================================================
     # CREATE
@@ -35,8 +38,10 @@ class TestTodoAPIWorkflow(APITestCase):
     # LIST
     # =============================================================
     def test_list_todos(self):
-        TodoFactory.create_batch(3, owner=self.user)
-        response = self.client.get(self.base_url)
+        TodoFactory.bulk_create_batch(3, owner=self.user)
+        # One keyset page SELECT (no COUNT), however many todos there are.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.base_url)
 
         assert response.status_code == status.HTTP_200_OK
         assert isinstance(response.data["results"], list)
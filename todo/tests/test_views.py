@@ -1,21 +1,40 @@
+import json
 import pytest
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
 from rest_framework import status
 from todo.models import Todo
-from .factories import TodoFactory, UserFactory
+from todo.views import TodoViewSet
+from .factories import TodoFactory, UserFactory, make_todos
+
+# Called directly with APIRequestFactory requests, skipping the middleware stack.
+retrieve_view = TodoViewSet.as_view({"get": "retrieve"})
+toggle_status_view = TodoViewSet.as_view({"patch": "toggle_status"})
 
 @pytest.mark.django_db
 class TestTodoViewSet(APITestCase):
     """Integration tests for TodoViewSet"""
     
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class; TestCase rolls each test back to this state
+        # and hands every test its own copy of cls.todo.
+        cls.user = UserFactory()
+        cls.todo = TodoFactory(owner=cls.user)
+        cls.list_url = reverse("todo:todo-list")
+        cls.detail_url = reverse("todo:todo-detail", kwargs={"pk": cls.todo.id})
+        cls.soft_delete_url = reverse("todo:todo-soft-delete", kwargs={"pk": cls.todo.id})
+        cls.restore_url = reverse("todo:todo-restore", kwargs={"pk": cls.todo.id})
+        cls.toggle_url = reverse("todo:todo-toggle-status", kwargs={"pk": cls.todo.id})
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = UserFactory()
         self.client.force_authenticate(user=self.user)
-        self.todo = TodoFactory(owner=self.user)
-        self.list_url = reverse("todo:todo-list")
-        self.detail_url = reverse("todo:todo-detail", kwargs={"pk": self.todo.id})
+        self.factory = APIRequestFactory()
+
+    def call_view(self, view, method, url):
+        request = getattr(self.factory, method)(url)
+        force_authenticate(request, user=self.user)
+        return view(request, pk=str(self.todo.id))
 
     # =============================================================
     # LIST
@@ -32,13 +51,24 @@ class TestTodoViewSet(APITestCase):
     # =============================================================
     def test_retrieve_todo(self):
         """Test retrieving a single todo"""
-        response = self.client.get(self.detail_url)
+        response = self.call_view(retrieve_view, "get", self.detail_url)
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["message"] == "Todo retrieved successfully"
         assert "data" in response.data
         assert response.data["data"]["id"] == str(self.todo.id)
 
+    def test_retrieve_todo_not_modified(self):
+        """Test retrieve answers 304 when the client's ETag is current"""
+        etag = self.client.get(self.detail_url)["ETag"]
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
     # =============================================================
     # CREATE
     # =============================================================
@@ -50,7 +80,9 @@ class TestTodoViewSet(APITestCase):
             "completed": False,
             "priority": "Medium"
         }
-        response = self.client.post(self.list_url, payload, format="json")
+        # A single INSERT: the response is built from the saved instance.
+        with self.assertNumQueries(1):
+            response = self.client.post(self.list_url, payload, format="json")
 
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data["message"] == "Todo created successfully"
@@ -68,7 +100,9 @@ class TestTodoViewSet(APITestCase):
             "completed": True,
             "priority": "High"
         }
-        response = self.client.put(self.detail_url, payload, format="json")
+        # SELECT, UPDATE.
+        with self.assertNumQueries(2):
+            response = self.client.put(self.detail_url, payload, format="json")
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["message"] == "Todo updated successfully"
@@ -94,22 +128,37 @@ class TestTodoViewSet(APITestCase):
     # =============================================================
     def test_soft_delete_todo(self):
         """Test soft deleting a todo"""
-        soft_delete_url = reverse("todo:todo-soft-delete", kwargs={"pk": self.todo.id})
-        response = self.client.delete(soft_delete_url)
+        with self.assertNumQueries(1):
+            response = self.client.delete(self.soft_delete_url)
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["message"] == "Todo deleted successfully"
         self.todo.refresh_from_db()
         assert self.todo.deleted_at is not None
 
+        response = self.client.delete(self.soft_delete_url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_destroy_removes_todo_from_cached_list(self):
+        """Test a deleted todo drops out of an already cached list page"""
+        response = self.client.get(self.list_url)
+        assert str(self.todo.id) in {item["id"] for item in response.data["results"]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(self.detail_url)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = self.client.get(self.list_url)
+        assert str(self.todo.id) not in {item["id"] for item in response.data["results"]}
+
     # =============================================================
     # RESTORE
     # =============================================================
     def test_restore_todo(self):
         """Test restoring a soft-deleted todo"""
         self.todo.soft_delete()
-        restore_url = reverse("todo:todo-restore", kwargs={"pk": self.todo.id})
-        response = self.client.post(restore_url)
+        with self.assertNumQueries(1):
+            response = self.client.post(self.restore_url)
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["message"] == "Todo restored successfully"
@@ -121,14 +170,65 @@ class TestTodoViewSet(APITestCase):
     # =============================================================
     def test_toggle_status(self):
         """Test toggling todo status"""
-        toggle_url = reverse("todo:todo-toggle-status", kwargs={"pk": self.todo.id})
-        response = self.client.patch(toggle_url)
+        response = self.call_view(toggle_status_view, "patch", self.toggle_url)
 
         assert response.status_code == status.HTTP_200_OK
         assert response.data["message"] == "Todo status toggled successfully"
         self.todo.refresh_from_db()
         assert self.todo.completed is True
 
+    # =============================================================
+    # BULK SOFT DELETE / RESTORE
+    # =============================================================
+    def test_bulk_delete_todos(self):
+        """Test soft deleting several todos in one request"""
+        other_todo = TodoFactory(owner=self.user)
+        response = self.client.post(
+            reverse("todo:todo-bulk-delete"),
+            {"ids": [str(self.todo.id), str(other_todo.id)]},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["data"]["count"] == 2
+        self.todo.refresh_from_db()
+        assert self.todo.deleted_at is not None
+
+    def test_bulk_delete_rejects_invalid_ids(self):
+        """Test bulk delete answers 400 for a malformed id"""
+        response = self.client.post(
+            reverse("todo:todo-bulk-delete"), {"ids": ["not-a-uuid"]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ids" in response.json()
+
+    def test_bulk_restore_todos(self):
+        """Test restoring several soft-deleted todos in one request"""
+        self.todo.soft_delete()
+        response = self.client.post(
+            reverse("todo:todo-bulk-restore"), {"ids": [str(self.todo.id)]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["data"]["count"] == 1
+        self.todo.refresh_from_db()
+        assert self.todo.deleted_at is None
+
+    # =============================================================
+    # EXPORT
+    # =============================================================
+    def test_export_todos(self):
+        """Test exporting todos streams them as a JSON array"""
+        other_todo = TodoFactory(owner=self.user)
+        response = self.client.get(reverse("todo:todo-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        data = json.loads(b"".join(response.streaming_content))
+        assert {item["id"] for item in data} == {str(self.todo.id), str(other_todo.id)}
+        assert "description" in data[0]
+
     # =============================================================
     # AUTH REQUIRED
     # =============================================================
@@ -147,7 +247,7 @@ class TestTodoViewSet(APITestCase):
         other_todo = TodoFactory(owner=other_user)
 
         response = self.client.get(self.list_url)
-        todo_ids = [todo["id"] for todo in response.data["results"]]
+        todo_ids = {todo["id"] for todo in response.data["results"]}
 
         assert str(other_todo.id) not in todo_ids
         assert str(self.todo.id) in todo_ids
@@ -160,20 +260,25 @@ class TestTodoViewSet(APITestCase):
 class TestTodoViewSetFilters(APITestCase):
     """Test filtering and searching functionality"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = UserFactory()
-        self.client.force_authenticate(user=self.user)
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+        cls.todo1, cls.todo2, cls.todo3 = make_todos(cls.user, [
+            {"completed": True, "priority": "High"},
+            {"completed": False, "priority": "Medium"},
+            {"completed": False, "priority": "Low"},
+        ])
 
-        self.todo1 = TodoFactory(owner=self.user, completed=True, priority="High")
-        self.todo2 = TodoFactory(owner=self.user, completed=False, priority="Medium")
-        self.todo3 = TodoFactory(owner=self.user, completed=False, priority="Low")
+        cls.list_url = reverse("todo:todo-list")
 
-        self.list_url = reverse("todo:todo-list")
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
 
     def test_filter_by_completed(self):
         """Test filtering by completed status"""
-        response = self.client.get(self.list_url, {"completed": "true"})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {"completed": "true"})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 1
 
@@ -188,7 +293,8 @@ class TestTodoViewSetFilters(APITestCase):
         unique_title = "Unique Searchable Title"
         TodoFactory(owner=self.user, title=unique_title)
 
-        response = self.client.get(self.list_url, {"search": "Unique"})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, {"search": "Unique"})
         assert response.status_code == status.HTTP_200_OK
         assert any("Unique" in todo["title"] for todo in response.data["results"])
 
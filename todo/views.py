@@ -1,15 +1,24 @@
-from django.db import transaction
-from django.shortcuts import get_object_or_404
-from django.utils import timezone
+import orjson
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Value, When
+from django.http import Http404, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from todo.models import Todo
 from todo.serializers import (
+    TodoFilter,
+    TodoListSerializer,
     TodoSerializer,
     TodoCreateSerializer,
     TodoUpdateSerializer,
     TodoPartialUpdateSerializer,
+    TodoBulkIdsSerializer,
+    TodoBulkResponseSerializer,
     TodoSoftDeleteResponseSerializer,
     TodoRestoreResponseSerializer,
     ToggleStatusResponseSerializer,
@@ -21,8 +30,12 @@ from todo.swagger import (
     todo_delete_schema,
     todo_restore_schema,
     todo_retrieve_schema,
-    todo_toggle_status_schema
+    todo_toggle_status_schema,
+    todo_bulk_delete_schema,
+    todo_bulk_restore_schema,
+    todo_export_schema
 )
+from todo.cache import TODO_LIST_CACHE_TIMEOUT, bump_todo_list_version, todo_list_cache_key
 from core.utils import api_response
 from core.logger import get_logger
 from core.throttles import FreeUserThrottle
@@ -32,16 +45,72 @@ from core.throttles import FreeUserThrottle
 # =============================================================
 logger = get_logger(__name__)
 
+# =============================================================
+# Response Serializer
+# =============================================================
+# Built once: its bound fields hold no per-request state, so writes can reuse
+# them instead of constructing (and deep-copying the fields of) a new serializer.
+todo_representation = TodoSerializer().to_representation
+
+# =============================================================
+# List Projection
+# =============================================================
+TODO_LIST_FIELDS = ("id", "title", "completed", "due_date", "priority", "created_at", "updated_at")
+TODO_EXPORT_FIELDS = TODO_LIST_FIELDS + ("description",)
+TODO_EXPORT_CHUNK_SIZE = 500
+
+
+def stream_json_array(rows):
+    """Yield ``rows`` as a JSON array, one chunk per row."""
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + orjson.dumps(row, option=orjson.OPT_UTC_Z)
+        separator = b","
+    yield b"]"
+
+# =============================================================
+# Conditional GET
+# =============================================================
+def todo_etag(request, pk=None, **kwargs):
+    """
+    ETag for a single todo, built from its updated_at. Fetches one column so a
+    matching If-None-Match answers 304 before the todo is loaded or serialized.
+    """
+    try:
+        updated_at = Todo.objects.filter(
+            pk=pk, owner=request.user, deleted_at__isnull=True
+        ).values_list("updated_at", flat=True).first()
+    except ValidationError:
+        # Malformed id: let retrieve() answer with its usual 404.
+        return None
+    if updated_at is None:
+        return None
+    return f"{pk}-{int(updated_at.timestamp() * 1_000_000)}"
+
+# =============================================================
+# Pagination
+# =============================================================
+class TodoCursorPagination(CursorPagination):
+    """
+    Keyset pagination over created_at: every page is a range scan on the
+    owner/created_at index instead of an OFFSET that grows with the page.
+    """
+    ordering = "-created_at"
+    page_size = 25
+
 # =============================================================
 # TODO VIEWSET
 # =============================================================
 class TodoViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [FreeUserThrottle]
+    pagination_class = TodoCursorPagination
 
-    filterset_fields = ["completed", "priority"]
+    filterset_class = TodoFilter
     search_fields = ["title", "description"]
-    ordering_fields = ["created_at", "updated_at", "priority"]
+    # Cursor pagination needs a (near-)unique ordering; priority has three values.
+    ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
 
     # =============================================================
@@ -49,6 +118,9 @@ class TodoViewSet(viewsets.ModelViewSet):
     # =============================================================
     def get_queryset(self):
         """Return all active todos for the authenticated user."""
+        if getattr(self, "swagger_fake_view", False):
+            # Schema generation runs without a real user to scope by.
+            return Todo.objects.none()
         return Todo.objects.filter(owner=self.request.user, deleted_at__isnull=True)
 
     def get_deleted_queryset(self):
@@ -58,14 +130,16 @@ class TodoViewSet(viewsets.ModelViewSet):
     # =============================================================
     # Dynamic Serializer
     # =============================================================
+    serializer_classes = {
+        "list": TodoListSerializer,
+        "retrieve": TodoSerializer,
+        "create": TodoCreateSerializer,
+        "update": TodoUpdateSerializer,
+        "partial_update": TodoPartialUpdateSerializer,
+    }
+
     def get_serializer_class(self):
-        return {
-            "list": TodoSerializer,
-            "retrieve": TodoSerializer,
-            "create": TodoCreateSerializer,
-            "update": TodoUpdateSerializer,
-            "partial_update": TodoPartialUpdateSerializer,
-        }.get(self.action, TodoSerializer)
+        return self.serializer_classes.get(self.action, TodoSerializer)
         
     # =============================================================
     # LIST
@@ -73,11 +147,24 @@ class TodoViewSet(viewsets.ModelViewSet):
     @todo_list_schema
     def list(self, request, *args, **kwargs):
         """List all todos for the authenticated user"""
-        queryset = self.filter_queryset(self.get_queryset())
+        # Cached per page until the user's next todo write bumps the version.
+        cache_key = todo_list_cache_key(request.user.id, request.build_absolute_uri())
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        # Plain dicts of the columns TodoListSerializer renders: no model instance
+        # per row, and status is computed by the database.
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *TODO_LIST_FIELDS,
+            status=Case(When(completed=True, then=Value("Completed")), default=Value("Pending"))
+        )
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(serializer.data)
+            cache.set(cache_key, response.data, TODO_LIST_CACHE_TIMEOUT)
+            return response
         
         serializer = self.get_serializer(queryset, many=True)
         logger.info("Todos retrieved successfully")
@@ -88,10 +175,27 @@ class TodoViewSet(viewsets.ModelViewSet):
             status.HTTP_200_OK
         )
         
+    # =============================================================
+    # EXPORT
+    # =============================================================
+    @todo_export_schema
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """Stream every matching todo as a JSON array"""
+        # iterator() reads through a server-side cursor on PostgreSQL, so memory
+        # stays at one chunk however many todos the user has.
+        rows = self.filter_queryset(self.get_queryset()).values(
+            *TODO_EXPORT_FIELDS,
+            status=Case(When(completed=True, then=Value("Completed")), default=Value("Pending"))
+        ).iterator(chunk_size=TODO_EXPORT_CHUNK_SIZE)
+        logger.info(f"Todo export started by user {request.user.id}")
+        return StreamingHttpResponse(stream_json_array(rows), content_type="application/json")
+
     # =============================================================
     # RETRIEVE
     # =============================================================
     @todo_retrieve_schema
+    @method_decorator(condition(etag_func=todo_etag))
     def retrieve(self, request, *args, **kwargs):
         todo = self.get_object()
         serializer = self.get_serializer(todo)
@@ -107,13 +211,12 @@ class TodoViewSet(viewsets.ModelViewSet):
     # CREATE
     # =============================================================
     @todo_create_schema
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         todo = serializer.save(owner=request.user)
         logger.info(f"Todo created: {todo.id} by user {request.user.id}")
-        response_data = TodoSerializer(todo).data
+        response_data = todo_representation(todo)
         return api_response(
             True,
             "Todo created successfully",
@@ -125,14 +228,13 @@ class TodoViewSet(viewsets.ModelViewSet):
     # UPDATE
     # =============================================================
     @todo_update_schema
-    @transaction.atomic
     def update(self, request, *args, **kwargs):
         todo = self.get_object()
         serializer = self.get_serializer(todo, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         logger.info(f"Todo updated: {todo.id} by user {request.user.id}")
-        response_data = TodoSerializer(todo).data
+        response_data = todo_representation(todo)
         return api_response(
             True,
             "Todo updated successfully",
@@ -144,14 +246,13 @@ class TodoViewSet(viewsets.ModelViewSet):
     # PARTIAL UPDATE
     # =============================================================
     @todo_update_schema
-    @transaction.atomic
     def partial_update(self, request, *args, **kwargs):
         todo = self.get_object()
         serializer = self.get_serializer(todo, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         logger.info(f"Todo partially updated: {todo.id} by user {request.user.id}")
-        response_data = TodoSerializer(todo).data
+        response_data = todo_representation(todo)
         return api_response(
             True,
             "Todo partially updated successfully",
@@ -164,13 +265,16 @@ class TodoViewSet(viewsets.ModelViewSet):
     # =============================================================
     @todo_delete_schema
     @action(detail=True, methods=["delete"], url_path="delete")
-    @transaction.atomic
     def soft_delete(self, request, pk=None):
-        todo = get_object_or_404(self.get_queryset(), id=pk)
-        todo.soft_delete()
-        logger.info(f"Todo soft-deleted: {todo.id} by user {request.user.id}")
+        # One conditional UPDATE, no SELECT first: a todo that is missing, not
+        # the user's, or already deleted matches no row.
+        if not Todo.bulk_soft_delete(self.get_queryset().filter(id=pk)):
+            raise Http404
+        # update() sends no post_save.
+        bump_todo_list_version(request.user.id)
+        logger.info(f"Todo soft-deleted: {pk} by user {request.user.id}")
         response_data = TodoSoftDeleteResponseSerializer({
-            "id": todo.id,
+            "id": pk,
             "message": "Todo deleted successfully",
         }).data
         return api_response(
@@ -185,13 +289,13 @@ class TodoViewSet(viewsets.ModelViewSet):
     # =============================================================
     @todo_restore_schema
     @action(detail=True, methods=["post"], url_path="restore")
-    @transaction.atomic
     def restore(self, request, pk=None):
-        todo = get_object_or_404(self.get_deleted_queryset(), id=pk)
-        todo.restore()
-        logger.info(f"Todo restored: {todo.id} by user {request.user.id}")
+        if not Todo.bulk_restore(self.get_deleted_queryset().filter(id=pk)):
+            raise Http404
+        bump_todo_list_version(request.user.id)
+        logger.info(f"Todo restored: {pk} by user {request.user.id}")
         response_data = TodoRestoreResponseSerializer({
-            "id": todo.id,
+            "id": pk,
             "message": "Todo restored successfully",
         }).data
         return api_response(
@@ -206,16 +310,16 @@ class TodoViewSet(viewsets.ModelViewSet):
     # =============================================================
     @todo_toggle_status_schema
     @action(detail=True, methods=["patch"], url_path="toggle-status")
-    @transaction.atomic
     def toggle_status(self, request, pk=None):
-        todo = get_object_or_404(self.get_queryset(), id=pk)
-        todo.completed = not todo.completed
-        todo.updated_at = timezone.now()
-        todo.save(update_fields=["completed", "updated_at"])
-        logger.info(f"Todo status toggled: {todo.id} by user {request.user.id} to {todo.completed}")
+        # One UPDATE ... RETURNING: no read-modify-write race and no read-back SELECT.
+        completed = Todo.toggle_completed(pk, request.user.id)
+        if completed is None:
+            raise Http404("No Todo matches the given query.")
+        bump_todo_list_version(request.user.id)
+        logger.info(f"Todo status toggled: {pk} by user {request.user.id} to {completed}")
         response_data = ToggleStatusResponseSerializer({
-            "id": todo.id,
-            "completed": todo.completed,
+            "id": pk,
+            "completed": completed,
         }).data
         return api_response(
             True,
@@ -223,3 +327,41 @@ class TodoViewSet(viewsets.ModelViewSet):
             response_data,
             status.HTTP_200_OK
         )
+
+    # =============================================================
+    # BULK SOFT DELETE
+    # =============================================================
+    @todo_bulk_delete_schema
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        serializer = TodoBulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = Todo.bulk_soft_delete(self.get_queryset().filter(id__in=serializer.validated_data["ids"]))
+        if count:
+            bump_todo_list_version(request.user.id)
+        logger.info(f"Todos bulk soft-deleted: {count} by user {request.user.id}")
+        return api_response(
+            True,
+            "Todos deleted successfully",
+            TodoBulkResponseSerializer({"count": count}).data,
+            status.HTTP_200_OK
+        )
+
+    # =============================================================
+    # BULK RESTORE
+    # =============================================================
+    @todo_bulk_restore_schema
+    @action(detail=False, methods=["post"], url_path="bulk-restore")
+    def bulk_restore(self, request):
+        serializer = TodoBulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = Todo.bulk_restore(self.get_deleted_queryset().filter(id__in=serializer.validated_data["ids"]))
+        if count:
+            bump_todo_list_version(request.user.id)
+        logger.info(f"Todos bulk restored: {count} by user {request.user.id}")
+        return api_response(
+            True,
+            "Todos restored successfully",
+            TodoBulkResponseSerializer({"count": count}).data,
+            status.HTTP_200_OK
+        )